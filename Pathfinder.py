@@ -1,43 +1,29 @@
-import tkinter as tk
-import time
+import argparse
+import contextlib
+import cProfile
+import hashlib
+import json
+import pstats
 import random
-from collections import deque
-import heapq
+import sys
+import time
+from array import array
+from collections import OrderedDict, deque
 
 # ──────────────────────────────────────────
 #  CONFIGURATION
 # ──────────────────────────────────────────
 ROWS           = 10
 COLS           = 10
-CELL_SIZE      = 54
-STEP_DELAY     = 0.18   # seconds between animation frames
 
 # Diagonal move cost (√2) for UCS
 DIAG_COST = 1.414
 
-# ──────────────────────────────────────────
-#  COLORS
-# ──────────────────────────────────────────
-COLOR = {
-    "empty"        : "#F5F5F5",
-    "wall"         : "#2C2C2C",
-    "start"        : "#27AE60",
-    "target"       : "#E74C3C",
-    "frontier"     : "#AED6F1",
-    "explored"     : "#2980B9",
-    "path"         : "#8E44AD",
-    # Bidirectional-specific
-    "fwd_frontier" : "#AED6F1",
-    "bwd_frontier" : "#FADBD8",
-    "fwd_explored" : "#2980B9",
-    "bwd_explored" : "#C0392B",
-    "meet"         : "#F39C12",
-}
-
 # ──────────────────────────────────────────
 #  STATIC GRID  (0 = empty, 1 = wall)
 # ──────────────────────────────────────────
-BASE_GRID = [
+# Stored row-major as one flat bytearray: cell (r, c) is BASE_GRID[r*COLS + c]
+BASE_GRID = bytearray(cell for row in [
     [0,0,0,0,0,0,0,0,0,0],
     [0,0,1,0,0,0,0,0,0,0],
     [0,0,0,0,0,0,0,0,1,0],
@@ -48,13 +34,13 @@ BASE_GRID = [
     [0,0,0,0,0,0,0,0,0,0],
     [0,0,0,0,1,0,0,0,0,0],
     [0,0,0,0,0,0,0,0,0,0],
-]
+] for cell in row)
 
 START  = (0, 0)
 TARGET = (9, 9)
 
-# Live grid (reset before each run)
-grid = [row[:] for row in BASE_GRID]
+# Live grid (reset before each run), same flat layout as BASE_GRID
+grid = bytearray(BASE_GRID)
 
 # ──────────────────────────────────────────
 #  MOVEMENT ORDER  (6 directions – black text)
@@ -78,591 +64,1981 @@ DIAG_PAIRS = {(1, 1), (-1, -1)}
 
 def reset_grid():
     """Restore grid to static walls only."""
-    global grid
-    grid = [row[:] for row in BASE_GRID]
+    global grid, _nbr_table, _reach_index, _grid_hash
+    # A buffer installed by attach_grid() is shared until set_wall() writes.
+    grid         = bytearray(BASE_GRID) if isinstance(BASE_GRID, bytearray) else BASE_GRID
+    _nbr_table   = None
+    _reach_index = None
+    _grid_hash   = None
+
+
+def set_grid(cells, rows, cols, start=None, target=None):
+    """Install a new static map (flat 0/1 cells, row-major) and reset.
+
+    START/TARGET move to the given cells, or to the top-left and
+    bottom-right corners when omitted.
+    """
+    attach_grid(bytearray(cells), rows, cols, start, target)
+
+
+def attach_grid(cells, rows, cols, start=None, target=None):
+    """Like set_grid(), but use the `cells` buffer in place.
+
+    For read-only buffers such as a memory-mapped map file (see mapfile.py):
+    nothing is copied up front, and the first set_wall() takes a private
+    copy of the live grid.
+    """
+    global ROWS, COLS, BASE_GRID, START, TARGET
+    if len(cells) != rows * cols:
+        raise ValueError(f"expected {rows * cols} cells, got {len(cells)}")
+    ROWS, COLS = rows, cols
+    BASE_GRID  = cells
+    START      = (0, 0) if start is None else tuple(start)
+    TARGET     = (rows - 1, cols - 1) if target is None else tuple(target)
+    reset_grid()
+
+
+def is_wall(row, col):
+    return grid[row * COLS + col] == 1
 
 
 def get_neighbors(row, col):
     """Yield valid (r, c, cost) neighbours in the required direction order."""
     for dr, dc in DIRECTIONS:
         r, c = row + dr, col + dc
-        if 0 <= r < ROWS and 0 <= c < COLS and grid[r][c] == 0:
+        if 0 <= r < ROWS and 0 <= c < COLS and grid[r * COLS + c] == 0:
             cost = DIAG_COST if (dr, dc) in DIAG_PAIRS else 1.0
             yield r, c, cost
 
 
 # ──────────────────────────────────────────
-#  DRAWING – standard
+#  NEIGHBOUR TABLE
+#  Precomputed adjacency for the live grid, fixed stride of one slot per
+#  direction.  The passable neighbours of cell id u, already in DIRECTIONS
+#  order, are
+#      nbr_node[u*NBR_STRIDE : u*NBR_STRIDE + nbr_count[u]]
+#  with their move costs at the same positions in nbr_cost.  Built on first
+#  use; set_wall() patches only the rows that can see the changed cell.
 # ──────────────────────────────────────────
 
-def draw_grid(canvas, frontier=frozenset(), explored=frozenset(),
-              path=frozenset(), status=""):
-    canvas.delete("all")
-    for row in range(ROWS):
-        for col in range(COLS):
-            x1, y1 = col * CELL_SIZE, row * CELL_SIZE
-            x2, y2 = x1 + CELL_SIZE, y1 + CELL_SIZE
-            cell = (row, col)
+NBR_STRIDE = len(DIRECTIONS)
+
+_nbr_table = None      # (nbr_count, nbr_node, nbr_cost) or None when stale
+
+
+def _fill_neighbors(u, nbr_count, nbr_node, nbr_cost):
+    row, col = divmod(u, COLS)
+    k = u * NBR_STRIDE
+    for r, c, cost in get_neighbors(row, col):
+        nbr_node[k] = r * COLS + c
+        nbr_cost[k] = cost
+        k += 1
+    nbr_count[u] = k - u * NBR_STRIDE
+
+
+def neighbor_table():
+    """Return (nbr_count, nbr_node, nbr_cost) for the live grid."""
+    global _nbr_table
+    if _nbr_table is None:
+        size      = ROWS * COLS
+        cells     = grid
+        nbr_count = bytearray(size)
+        nbr_node  = array('i', [-1]) * (size * NBR_STRIDE)
+        nbr_cost  = array('d', [0.0]) * (size * NBR_STRIDE)
+        moves     = [(dr, dc, dr * COLS + dc,
+                      DIAG_COST if (dr, dc) in DIAG_PAIRS else 1.0)
+                     for dr, dc in DIRECTIONS]
+        for row in range(ROWS):
+            row_moves = [(dc, delta, cost) for dr, dc, delta, cost in moves
+                         if 0 <= row + dr < ROWS]
+            u = row * COLS
+            for col in range(COLS):
+                k = u * NBR_STRIDE
+                for dc, delta, cost in row_moves:
+                    if 0 <= col + dc < COLS and not cells[u + delta]:
+                        nbr_node[k] = u + delta
+                        nbr_cost[k] = cost
+                        k += 1
+                nbr_count[u] = k - u * NBR_STRIDE
+                u += 1
+        _nbr_table = (nbr_count, nbr_node, nbr_cost)
+    return _nbr_table
+
+
+_grid_hash = None      # digest of the live wall layout, None when stale
+
+
+def grid_hash():
+    """Short digest of the live grid's size and wall layout."""
+    global _grid_hash
+    if _grid_hash is None:
+        h = hashlib.blake2b(digest_size=16)
+        h.update(f"{ROWS}x{COLS}".encode())
+        h.update(grid[:ROWS * COLS])
+        _grid_hash = h.hexdigest()
+    return _grid_hash
+
+
+def set_wall(row, col, wall=True):
+    """Add or remove a wall on the live grid, keeping the indexes in sync."""
+    global grid, _grid_hash
+    u = row * COLS + col
+    if grid[u] == int(wall):
+        return
+    if not isinstance(grid, bytearray):
+        grid = bytearray(grid)
+    grid[u]    = int(wall)
+    _grid_hash = None
+    if _nbr_table is not None:
+        for dr, dc in DIRECTIONS:
+            r, c = row - dr, col - dc
+            if 0 <= r < ROWS and 0 <= c < COLS:
+                _fill_neighbors(r * COLS + c, *_nbr_table)
+    if _reach_index is not None:
+        if wall:
+            _reach_index.close_cell(u)
+        else:
+            _reach_index.open_cell(u)
 
-            if cell == START:
-                color = COLOR["start"]
-            elif cell == TARGET:
-                color = COLOR["target"]
-            elif grid[row][col] == 1:
-                color = COLOR["wall"]
-            elif cell in path:
-                color = COLOR["path"]
-            elif cell in explored:
-                color = COLOR["explored"]
-            elif cell in frontier:
-                color = COLOR["frontier"]
-            else:
-                color = COLOR["empty"]
 
-            canvas.create_rectangle(x1, y1, x2, y2,
-                                    fill=color, outline="#BBBBBB", width=1)
+# ──────────────────────────────────────────
+#  REACHABILITY INDEX
+#  Connected-component labels for the open cells of the live grid, so a
+#  walled-off TARGET is reported at once instead of after flooding the
+#  whole component.  Every direction's opposite is also in DIRECTIONS, so
+#  reachability is symmetric and plain undirected components suffice.
+#  Built on first use; set_wall() updates it in place.
+# ──────────────────────────────────────────
 
-            if cell == START:
-                label, fg = "S", "white"
-            elif cell == TARGET:
-                label, fg = "T", "white"
-            elif grid[row][col] == 1:
-                label, fg = "■", "#AAAAAA"
-            else:
-                label, fg = "", "black"
-
-            if label:
-                canvas.create_text(x1 + CELL_SIZE//2, y1 + CELL_SIZE//2,
-                                   text=label, fill=fg,
-                                   font=("Arial", 14, "bold"))
-
-    canvas.create_text(COLS * CELL_SIZE // 2, ROWS * CELL_SIZE + 15,
-                       text=status, fill="#333333",
-                       font=("Arial", 10, "italic"))
-
-
-# ──────────────────────────────────────────
-#  DRAWING – Bidirectional variant
-# ──────────────────────────────────────────
-
-def draw_grid_bidir(canvas,
-                    fwd_frontier=frozenset(), bwd_frontier=frozenset(),
-                    fwd_explored=frozenset(), bwd_explored=frozenset(),
-                    path=frozenset(), meet=None, status=""):
-    canvas.delete("all")
-    for row in range(ROWS):
-        for col in range(COLS):
-            x1, y1 = col * CELL_SIZE, row * CELL_SIZE
-            x2, y2 = x1 + CELL_SIZE, y1 + CELL_SIZE
-            cell = (row, col)
-
-            if cell == START:
-                color = COLOR["start"]
-            elif cell == TARGET:
-                color = COLOR["target"]
-            elif grid[row][col] == 1:
-                color = COLOR["wall"]
-            elif cell in path:
-                color = COLOR["path"]
-            elif cell == meet:
-                color = COLOR["meet"]
-            elif cell in fwd_explored and cell in bwd_explored:
-                color = COLOR["meet"]
-            elif cell in fwd_explored:
-                color = COLOR["fwd_explored"]
-            elif cell in bwd_explored:
-                color = COLOR["bwd_explored"]
-            elif cell in fwd_frontier:
-                color = COLOR["fwd_frontier"]
-            elif cell in bwd_frontier:
-                color = COLOR["bwd_frontier"]
-            else:
-                color = COLOR["empty"]
+class ReachabilityIndex:
+    """Component label per cell (-1 for walls) with incremental updates."""
 
-            canvas.create_rectangle(x1, y1, x2, y2,
-                                    fill=color, outline="#BBBBBB", width=1)
+    def __init__(self):
+        nbr_count, nbr_node, _ = neighbor_table()
+        size        = ROWS * COLS
+        self.label  = array('i', [-1]) * size
+        self.size   = {}
+        self.next_label = 0
 
-            if cell == START:
-                label, fg = "S", "white"
-            elif cell == TARGET:
-                label, fg = "T", "white"
-            elif grid[row][col] == 1:
-                label, fg = "■", "#AAAAAA"
-            else:
-                label, fg = "", "black"
+        label = self.label
+        for u in range(size):
+            if grid[u] or label[u] >= 0:
+                continue
+            comp     = self._new_label()
+            label[u] = comp
+            queue    = deque([u])
+            while queue:
+                x    = queue.popleft()
+                base = x * NBR_STRIDE
+                for v in nbr_node[base:base + nbr_count[x]]:
+                    if label[v] < 0:
+                        label[v] = comp
+                        queue.append(v)
+            self.size[comp] = 0
+        for comp in label:
+            if comp >= 0:
+                self.size[comp] += 1
+
+    @classmethod
+    def from_labels(cls, label):
+        """Read-only index over an existing label array (no size counts)."""
+        index = cls.__new__(cls)
+        index.label      = label
+        index.size       = {}
+        index.next_label = 0
+        return index
+
+    def _new_label(self):
+        self.next_label += 1
+        return self.next_label - 1
+
+    def connected(self, a, b):
+        """True if cell id b can be reached from cell id a."""
+        return a == b or (self.label[a] >= 0 and self.label[a] == self.label[b])
+
+    def _open_neighbors(self, u):
+        nbr_count, nbr_node, _ = neighbor_table()
+        base = u * NBR_STRIDE
+        return [v for v in nbr_node[base:base + nbr_count[u]] if not grid[v]]
+
+    def _relabel(self, seed, old, new):
+        """Move the component of `seed` (currently labelled old) to new."""
+        nbr_count, nbr_node, _ = neighbor_table()
+        label = self.label
+        label[seed] = new
+        queue = deque([seed])
+        moved = 1
+        while queue:
+            x    = queue.popleft()
+            base = x * NBR_STRIDE
+            for v in nbr_node[base:base + nbr_count[x]]:
+                if label[v] == old:
+                    label[v] = new
+                    queue.append(v)
+                    moved += 1
+        return moved
+
+    def open_cell(self, u):
+        """Cell u stopped being a wall: join it to its neighbours' components.
+
+        Smaller components are relabelled into the largest one, so the cost
+        is proportional to the cells that actually change label.
+        """
+        comps = {self.label[v] for v in self._open_neighbors(u)}
+        if not comps:
+            comp = self._new_label()
+            self.label[u]   = comp
+            self.size[comp] = 1
+            return
+        keep = max(comps, key=self.size.__getitem__)
+        self.label[u]    = keep
+        self.size[keep] += 1
+        for comp in comps - {keep}:
+            seed = next(v for v in self._open_neighbors(u)
+                        if self.label[v] == comp)
+            self.size[keep] += self._relabel(seed, comp, keep)
+            del self.size[comp]
+
+    def close_cell(self, u):
+        """Cell u became a wall: split its component if u was a cut cell.
+
+        One BFS runs from each open neighbour, advanced in lock-step.
+        Searches that touch are merged; a search that runs dry has
+        enumerated a component that no longer reaches the others and is
+        given a fresh label.  Work stops once a single search is left, so
+        the cost is bounded by the smaller side(s) of any split.
+        """
+        old = self.label[u]
+        if old < 0:
+            return
+        self.label[u]    = -1
+        self.size[old]  -= 1
+        seeds = self._open_neighbors(u)
+        if not seeds:
+            del self.size[old]
+            return
+        if len(seeds) == 1:
+            return
+
+        nbr_count, nbr_node, _ = neighbor_table()
+        label  = self.label
+        owner  = {seed: i for i, seed in enumerate(seeds)}   # cell -> search
+        root   = list(range(len(seeds)))
+        queues = [deque([seed]) for seed in seeds]
+        cells  = [[seed] for seed in seeds]
+
+        def find(i):
+            while root[i] != i:
+                root[i] = root[root[i]]
+                i = root[i]
+            return i
+
+        active = set(root)
+        while len(active) > 1:
+            for i in list(active):
+                if i not in active or len(active) == 1:
+                    continue
+                queue = queues[i]
+                if not queue:
+                    # Ran dry: a separate component now.
+                    comp = self._new_label()
+                    for x in cells[i]:
+                        label[x] = comp
+                    self.size[comp] = len(cells[i])
+                    self.size[old] -= len(cells[i])
+                    active.discard(i)
+                    continue
+                x    = queue.popleft()
+                base = x * NBR_STRIDE
+                for v in nbr_node[base:base + nbr_count[x]]:
+                    if label[v] != old:
+                        continue
+                    j = owner.get(v)
+                    if j is None:
+                        owner[v] = i
+                        queue.append(v)
+                        cells[i].append(v)
+                        continue
+                    j = find(j)
+                    if j != i:
+                        # The two searches met: merge j into i.
+                        root[j] = i
+                        queue.extend(queues[j])
+                        cells[i].extend(cells[j])
+                        queues[j], cells[j] = deque(), []
+                        active.discard(j)
+
+
+_reach_index = None
+
+
+def reachability():
+    """Return the ReachabilityIndex for the live grid, building it once."""
+    global _reach_index
+    if _reach_index is None:
+        _reach_index = ReachabilityIndex()
+    return _reach_index
+
+
+def _endpoints(start, target):
+    """(start, target) with None replaced by the current START/TARGET."""
+    return (START if start is None else tuple(start),
+            TARGET if target is None else tuple(target))
+
+
+def reachable(start=None, target=None):
+    """True if `target` can be reached from `start` on the live grid.
+
+    start/target default to the current START/TARGET.
+    """
+    start, target = _endpoints(start, target)
+    return reachability().connected(start[0] * COLS + start[1],
+                                    target[0] * COLS + target[1])
+
+
+def adopt_grid(cells, rows, cols, nbr_table, labels):
+    """Install prebuilt grid buffers as the live grid, without copying.
+
+    Meant for worker processes that map the grid, its neighbour table and
+    its component labels from shared memory: nothing is rebuilt, and the
+    grid must be treated as read-only afterwards.
+    """
+    global ROWS, COLS, BASE_GRID, grid, _nbr_table, _reach_index, _grid_hash
+    ROWS, COLS   = rows, cols
+    BASE_GRID    = grid = cells
+    _nbr_table   = nbr_table
+    _reach_index = ReachabilityIndex.from_labels(labels)
+    _grid_hash   = None
 
-            if label:
-                canvas.create_text(x1 + CELL_SIZE//2, y1 + CELL_SIZE//2,
-                                   text=label, fill=fg,
-                                   font=("Arial", 14, "bold"))
 
-    canvas.create_text(COLS * CELL_SIZE // 2, ROWS * CELL_SIZE + 15,
-                       text=status, fill="#333333",
-                       font=("Arial", 10, "italic"))
+# ──────────────────────────────────────────
+#  SEARCH EVENTS
+#  Every search below is a plain generator: no Tk, no sleeps.  It yields
+#  small (kind, node, value) tuples describing only what changed, and the
+#  GUI (or any other consumer) decides what to do with them.  Nodes are
+#  integer cell ids (see node_id / cell_of); only EV_FOUND carries a list
+#  of (row, col) cells.
+# ──────────────────────────────────────────
+
+EV_PUSH    = 0   # node entered the frontier          value = depth / cost
+EV_EXPAND  = 1   # node popped and expanded           value = depth / cost
+EV_DISCARD = 2   # frontier entry dropped unexpanded  value = depth / cost
+EV_FOUND   = 3   # search finished, node = path       value = path cost
+EV_FAIL    = 4   # search finished without a path
+EV_LIMIT   = 5   # iterative deepening restarts       value = new depth limit
+EV_GOAL    = 6   # one of several goals reached and    value = path cost
+                 # the search goes on, node = path
+
+EV_BWD     = 8   # OR-ed into kind for the backward half of Bidir
+
+
+def path_cost(path):
+    """Sum of move costs along a path of (row, col) cells."""
+    cost = 0.0
+    for (r1, c1), (r2, c2) in zip(path, path[1:]):
+        cost += DIAG_COST if (r2 - r1, c2 - c1) in DIAG_PAIRS else 1.0
+    return cost
 
 
 # ──────────────────────────────────────────
-#  BFS
+#  NODE STORE
+#  One integer per cell (r*COLS + c).  Visited state, parent pointers and
+#  g-costs live in flat typed arrays; a path is only rebuilt once, at the
+#  end, by walking parents.
 # ──────────────────────────────────────────
 
-def bfs(canvas):
+INF = float('inf')
 
-    def run_bfs(start_node=START):
-        queue    = deque([[start_node]])
-        explored = set()
-        in_queue = {start_node}
+UNSEEN   = 0     # NodeStore.visited flags
+FRONTIER = 1
+EXPLORED = 2
 
-        while queue:
-            path    = queue.popleft()
-            current = path[-1]
-            in_queue.discard(current)
 
-            if current in explored:
-                continue
-            explored.add(current)
+def node_id(row, col):
+    return row * COLS + col
 
-            draw_grid(canvas,
-                      frontier=in_queue.copy(),
-                      explored=explored,
-                      status=f"BFS – exploring {current}")
-            canvas.update()
-            time.sleep(STEP_DELAY)
 
-            if current == TARGET:
-                draw_grid(canvas, path=set(path),
-                          status=f"BFS – Path Found! ✓  length={len(path)}")
-                canvas.update()
-                return path
+def cell_of(node):
+    return divmod(node, COLS)
 
-            row, col = current
-            for r, c, _ in get_neighbors(row, col):
-                if (r, c) not in explored and (r, c) not in in_queue:
-                    queue.append(path + [(r, c)])
-                    in_queue.add((r, c))
 
-        draw_grid(canvas, status="BFS – No path found ✗")
-        canvas.update()
-        return None
+def hop_distance(a, b):
+    """Fewest moves from cell id a to cell id b if there were no walls.
 
-    return run_bfs()
+    Only the (1, 1) / (-1, -1) diagonal exists, so a single move covers a
+    row and a column step only when both go the same way.
+    """
+    ar, ac = divmod(a, COLS)
+    br, bc = divmod(b, COLS)
+    dr, dc = br - ar, bc - ac
+    if dr * dc >= 0:
+        return max(abs(dr), abs(dc))
+    return abs(dr) + abs(dc)
 
 
-# ──────────────────────────────────────────
-#  DFS
-# ──────────────────────────────────────────
+def cost_distance(a, b):
+    """Cheapest move cost from cell id a to cell id b if there were no walls.
 
-def dfs(canvas):
+    The admissible (and consistent) A* heuristic for this move set: a
+    DIAG_COST diagonal replaces one row step plus one column step, but only
+    when both go the same way; otherwise every step is a unit move.
+    """
+    ar, ac = divmod(a, COLS)
+    br, bc = divmod(b, COLS)
+    dr, dc = abs(br - ar), abs(bc - ac)
+    if (br - ar) * (bc - ac) >= 0:
+        diag = min(dr, dc)
+        return diag * DIAG_COST + (dr + dc - 2 * diag)
+    return dr + dc
 
-    def run_dfs(start_node=START):
-        stack    = [[start_node]]
-        explored = set()
-        in_stack = {start_node}
 
-        while stack:
-            path    = stack.pop()
-            current = path[-1]
-            in_stack.discard(current)
+class NodeStore:
+    """Visited flags, parents and g-costs for every cell of one search."""
 
-            if current in explored:
-                continue
-            explored.add(current)
+    __slots__ = ("visited", "parent", "g")
 
-            draw_grid(canvas,
-                      frontier=in_stack.copy(),
-                      explored=explored,
-                      status=f"DFS – exploring {current}")
-            canvas.update()
-            time.sleep(STEP_DELAY)
+    def __init__(self, size=None):
+        if size is None:
+            size = ROWS * COLS
+        self.visited = bytearray(size)
+        self.parent  = array('i', [-1]) * size
+        self.g       = array('d', [INF]) * size
 
-            if current == TARGET:
-                draw_grid(canvas, path=set(path),
-                          status=f"DFS – Path Found! ✓  length={len(path)}")
-                canvas.update()
-                return path
+    def path_to(self, node):
+        """(row, col) cells from the root of the search tree to `node`."""
+        parent = self.parent
+        path   = []
+        while node != -1:
+            path.append(cell_of(node))
+            node = parent[node]
+        path.reverse()
+        return path
 
-            row, col = current
-            for r, c, _ in get_neighbors(row, col):
-                if (r, c) not in explored and (r, c) not in in_stack:
-                    stack.append(path + [(r, c)])
-                    in_stack.add((r, c))
 
-        draw_grid(canvas, status="DFS – No path found ✗")
-        canvas.update()
-        return None
+# ──────────────────────────────────────────
+#  INDEXED PRIORITY QUEUE
+#  Binary min-heap of node ids with decrease-key.  pos[u] is u's slot in
+#  the heap (-1 when absent), so membership, size and a node's current
+#  key are all O(1).  Keys live in a caller-supplied sequence indexed by
+#  node id – UCS passes NodeStore.g so the frontier keys *are* the best
+#  known costs and nothing is duplicated.
+# ──────────────────────────────────────────
 
-    return run_dfs()
+class IndexedHeap:
+    """Min-heap of node ids keyed by key[u], with O(1) membership."""
+
+    __slots__ = ("heap", "pos", "key")
+
+    def __init__(self, key):
+        self.heap = []
+        self.pos  = array('i', [-1]) * len(key)
+        self.key  = key
+
+    def __len__(self):
+        return len(self.heap)
+
+    def __contains__(self, u):
+        return self.pos[u] >= 0
+
+    def peek(self):
+        return self.heap[0]
+
+    def top_key(self):
+        return self.key[self.heap[0]] if self.heap else INF
+
+    def push(self, u, k):
+        """Insert u with key k, or move it if it is already queued."""
+        old = self.key[u]
+        self.key[u] = k
+        i = self.pos[u]
+        if i < 0:
+            self.heap.append(u)
+            self.pos[u] = len(self.heap) - 1
+            self._sift_up(len(self.heap) - 1)
+        elif k < old:
+            self._sift_up(i)
+        else:
+            self._sift_down(i)
+
+    def pop(self):
+        heap, pos = self.heap, self.pos
+        top  = heap[0]
+        last = heap.pop()
+        pos[top] = -1
+        if heap:
+            heap[0]   = last
+            pos[last] = 0
+            self._sift_down(0)
+        return top
+
+    def remove(self, u):
+        heap, pos = self.heap, self.pos
+        i = pos[u]
+        if i < 0:
+            return
+        pos[u] = -1
+        last = heap.pop()
+        if i < len(heap):
+            heap[i]   = last
+            pos[last] = i
+            self._sift_up(i)
+            self._sift_down(pos[last])
+
+    def _sift_up(self, i):
+        heap, pos, key = self.heap, self.pos, self.key
+        u = heap[i]
+        k = key[u]
+        while i:
+            parent = (i - 1) >> 1
+            p = heap[parent]
+            if not k < key[p]:
+                break
+            heap[i] = p
+            pos[p]  = i
+            i = parent
+        heap[i] = u
+        pos[u]  = i
+
+    def _sift_down(self, i):
+        heap, pos, key = self.heap, self.pos, self.key
+        n = len(heap)
+        u = heap[i]
+        k = key[u]
+        child = 2 * i + 1
+        while child < n:
+            right = child + 1
+            if right < n and key[heap[right]] < key[heap[child]]:
+                child = right
+            c = heap[child]
+            if not key[c] < k:
+                break
+            heap[i] = c
+            pos[c]  = i
+            i = child
+            child = 2 * i + 1
+        heap[i] = u
+        pos[u]  = i
 
 
 # ──────────────────────────────────────────
-#  DLS
+#  BFS
 # ──────────────────────────────────────────
 
-def dls(canvas, limit):
+def bfs_search(start=None, target=None, store=None, full=False):
+    start, target = _endpoints(start, target)
+    if store is None:
+        store = NodeStore()
+    visited = store.visited
+    parent  = store.parent
+    depth   = store.g
+    s       = node_id(*start)
+    t       = -1 if full else node_id(*target)
+    nbr_count, nbr_node, nbr_cost = neighbor_table()
+
+    queue      = deque([s])
+    visited[s] = FRONTIER
+    depth[s]   = 0
+
+    while queue:
+        current = queue.popleft()
+        visited[current] = EXPLORED
+        d = int(depth[current])
+        yield EV_EXPAND, current, d
+
+        if current == t:
+            path = store.path_to(t)
+            yield EV_FOUND, path, path_cost(path)
+            return
+
+        base = current * NBR_STRIDE
+        for v in nbr_node[base:base + nbr_count[current]]:
+            if not visited[v]:
+                visited[v] = FRONTIER
+                parent[v]  = current
+                depth[v]   = d + 1
+                queue.append(v)
+                yield EV_PUSH, v, d + 1
+
+    yield EV_FAIL, None, None
 
-    def run_dls(start_node=START, lim=limit):
-        stack    = [([start_node], 0)]
-        explored = set()
-        in_stack = {start_node}
 
-        while stack:
-            path, depth = stack.pop()
-            current     = path[-1]
-            in_stack.discard(current)
+# ──────────────────────────────────────────
+#  BFS – bitboard engine
+#  The whole grid is one Python int with bit r*COLS + c set for every open
+#  cell.  A wide BFS layer is advanced for every frontier cell at once by
+#  six shift-and-mask operations (one per direction); the column masks
+#  stop horizontal and diagonal shifts from wrapping onto the next row.
+#  Each shift costs the whole grid, so a thin frontier – a corridor maze
+#  runs for tens of thousands of layers a few cells wide – is advanced
+#  node by node through the neighbour table instead, and the engine
+#  switches back once the frontier widens again.  Only the frontiers that
+#  were shifted are kept (as ints); cells reached node by node record a
+#  parent, so the path is rebuilt from whichever of the two produced it.
+# ──────────────────────────────────────────
+
+_OPEN_BITS = bytes.maketrans(b"\x00\x01", b"10")
+_WIDE_CELLS = 1024       # a layer is wide from ROWS*COLS / _WIDE_CELLS cells
+
+
+def bitboard_masks():
+    """Return (open_cells, not_first_col, not_last_col) for the live grid."""
+    size = ROWS * COLS
+    # int(…, 2) reads the most significant bit first, so reverse the cells
+    open_cells    = int(bytes(grid[:size]).translate(_OPEN_BITS)[::-1], 2)
+    not_first_col = int(("1" * (COLS - 1) + "0") * ROWS, 2)
+    not_last_col  = int(("0" + "1" * (COLS - 1)) * ROWS, 2)
+    return open_cells, not_first_col, not_last_col
 
-            if current in explored:
-                continue
-            explored.add(current)
-
-            draw_grid(canvas,
-                      frontier=in_stack.copy(),
-                      explored=explored,
-                      status=f"DLS – exploring {current}  depth={depth}/{lim}")
-            canvas.update()
-            time.sleep(STEP_DELAY)
-
-            if current == TARGET:
-                draw_grid(canvas, path=set(path),
-                          status=f"DLS – Path Found! ✓  depth={depth}")
-                canvas.update()
-                return path
-
-            if depth >= lim:
-                continue
 
-            row, col = current
-            for r, c, _ in get_neighbors(row, col):
-                if (r, c) not in explored and (r, c) not in in_stack:
-                    stack.append((path + [(r, c)], depth + 1))
-                    in_stack.add((r, c))
+def _layer_cells(layer):
+    """Cell ids of the set bits in a layer, lowest first."""
+    bits = bin(layer)[:1:-1]
+    i    = bits.find("1")
+    while i >= 0:
+        yield i
+        i = bits.find("1", i + 1)
 
-        draw_grid(canvas,
-                  status=f"DLS – No path within depth limit {lim} ✗")
-        canvas.update()
-        return None
 
-    return run_dls()
+def _layer_bits(cells):
+    """The int with a bit set for every cell id in `cells`."""
+    size = ROWS * COLS
+    bits = bytearray(b"0") * size
+    for u in cells:
+        bits[size - 1 - u] = 0x31
+    return int(bits, 2)
+
+
+def _layer_parent(layer, node):
+    """A cell of `layer` one move before `node`."""
+    row, col = cell_of(node)
+    for dr, dc in DIRECTIONS:
+        r, c = row - dr, col - dc
+        if 0 <= r < ROWS and 0 <= c < COLS and layer >> (r * COLS + c) & 1:
+            return r * COLS + c
+    raise ValueError(f"no cell of the layer leads to {cell_of(node)}")
+
+
+def bitboard_search(start=None, target=None):
+    start, target = _endpoints(start, target)
+    size    = ROWS * COLS
+    s, t    = node_id(*start), node_id(*target)
+    thin    = max(16, size // _WIDE_CELLS)
+    nbr_count, nbr_node, nbr_cost = neighbor_table()
+    visited = bytearray(size)
+    parent  = array('i', [-1]) * size
+    shifted = {}         # depth -> frontier int advanced by shifts
+    masks   = None
+    unseen  = None       # open, unreached cells while advancing by shifts
+
+    frontier   = [s]
+    visited[s] = 1
+    depth      = 0
+    while True:
+        cells = list(_layer_cells(frontier)) if unseen is not None else frontier
+        for u in cells:
+            visited[u] = 1
+            yield EV_EXPAND, u, depth
+        if visited[t]:
+            break
+
+        if len(cells) >= (thin if unseen is not None else 2 * thin):
+            if unseen is None:
+                if masks is None:
+                    masks = bitboard_masks()
+                frontier = _layer_bits(cells)
+                unseen   = int(visited.translate(_OPEN_BITS)[::-1], 2) & masks[0]
+            open_cells, not_first, not_last = masks
+            down, diag = COLS, COLS + 1
+            shifted[depth] = frontier
+            nxt = ((frontier >> down)                    # Up
+                   | ((frontier << 1) & not_first)       # Right
+                   | (frontier << down)                  # Bottom
+                   | ((frontier << diag) & not_first)    # Bottom-Right
+                   | ((frontier >> 1) & not_last)        # Left
+                   | ((frontier >> diag) & not_last))    # Top-Left
+            frontier = nxt & unseen
+            unseen  &= ~frontier
+        else:
+            unseen = None
+            nxt    = []
+            for u in cells:
+                base = u * NBR_STRIDE
+                for v in nbr_node[base:base + nbr_count[u]]:
+                    if not visited[v]:
+                        visited[v] = 1
+                        parent[v]  = u
+                        nxt.append(v)
+            frontier = nxt
+        if not frontier:
+            yield EV_FAIL, None, None
+            return
+        depth += 1
+
+    node = t
+    path = [target]
+    for d in range(depth - 1, -1, -1):
+        node = parent[node] if parent[node] >= 0 else _layer_parent(shifted[d], node)
+        path.append(cell_of(node))
+    path.reverse()
+    yield EV_FOUND, path, path_cost(path)
 
 
 # ──────────────────────────────────────────
-#  IDDFS
+#  DFS
 # ──────────────────────────────────────────
 
-def iddfs(canvas):
-    max_lim  = ROWS * COLS
+def dfs_search(start=None, target=None):
+    start, target = _endpoints(start, target)
+    store   = NodeStore()
+    visited = store.visited
+    parent  = store.parent
+    depth   = store.g
+    s, t    = node_id(*start), node_id(*target)
+    nbr_count, nbr_node, nbr_cost = neighbor_table()
+
+    stack      = [s]
+    visited[s] = FRONTIER
+    depth[s]   = 0
+
+    while stack:
+        current = stack.pop()
+        visited[current] = EXPLORED
+        d = int(depth[current])
+        yield EV_EXPAND, current, d
+
+        if current == t:
+            path = store.path_to(t)
+            yield EV_FOUND, path, path_cost(path)
+            return
+
+        base = current * NBR_STRIDE
+        for v in nbr_node[base:base + nbr_count[current]]:
+            if not visited[v]:
+                visited[v] = FRONTIER
+                parent[v]  = current
+                depth[v]   = d + 1
+                stack.append(v)
+                yield EV_PUSH, v, d + 1
+
+    yield EV_FAIL, None, None
 
-    for limit in range(max_lim + 1):
-        draw_grid(canvas,
-                  status=f"IDDFS – starting iteration  depth limit = {limit}")
-        canvas.update()
-        time.sleep(STEP_DELAY)
 
-        stack    = [([START], 0)]
-        explored = set()
-        in_stack = {START}
+# ──────────────────────────────────────────
+#  DLS
+# ──────────────────────────────────────────
 
-        while stack:
-            path, depth = stack.pop()
-            current     = path[-1]
-            in_stack.discard(current)
+def dls_search(start=None, target=None, limit=15):
+    start, target = _endpoints(start, target)
+    store   = NodeStore()
+    visited = store.visited
+    parent  = store.parent
+    depth   = store.g
+    s, t    = node_id(*start), node_id(*target)
+    nbr_count, nbr_node, nbr_cost = neighbor_table()
+
+    stack      = [s]
+    visited[s] = FRONTIER
+    depth[s]   = 0
+
+    while stack:
+        current = stack.pop()
+        visited[current] = EXPLORED
+        d = int(depth[current])
+        yield EV_EXPAND, current, d
+
+        if current == t:
+            path = store.path_to(t)
+            yield EV_FOUND, path, path_cost(path)
+            return
+
+        if d >= limit:
+            continue
 
-            if current in explored:
-                continue
-            explored.add(current)
+        base = current * NBR_STRIDE
+        for v in nbr_node[base:base + nbr_count[current]]:
+            if not visited[v]:
+                visited[v] = FRONTIER
+                parent[v]  = current
+                depth[v]   = d + 1
+                stack.append(v)
+                yield EV_PUSH, v, d + 1
 
-            draw_grid(canvas,
-                      frontier=in_stack.copy(),
-                      explored=explored,
-                      status=f"IDDFS – limit={limit}  exploring {current}  depth={depth}")
-            canvas.update()
-            time.sleep(STEP_DELAY)
+    yield EV_FAIL, None, None
 
-            if current == TARGET:
-                draw_grid(canvas, path=set(path),
-                          status=f"IDDFS – Path Found! ✓  depth limit={limit}  length={len(path)}")
-                canvas.update()
-                return path
 
-            if depth < limit:
-                row, col = current
-                for r, c, _ in get_neighbors(row, col):
-                    if (r, c) not in explored and (r, c) not in in_stack:
-                        stack.append((path + [(r, c)], depth + 1))
-                        in_stack.add((r, c))
+# ──────────────────────────────────────────
+#  IDDFS
+# ──────────────────────────────────────────
 
-        draw_grid(canvas, explored=explored,
-                  status=f"IDDFS – limit={limit} exhausted, deepening…")
-        canvas.update()
-        time.sleep(STEP_DELAY * 1.5)
+def iddfs_search(start=None, target=None):
+    """Iterative deepening with O(depth) search state.
+
+    Each iteration is a DFS that keeps only the current path and, per
+    level, a cursor into the neighbour table.  A per-iteration best-depth
+    table replaces a global explored set: a cell is re-entered only when
+    reached by a strictly shallower route, so shorter routes found later in
+    the iteration are not pruned.  The table is stamped with the iteration
+    number, so it is never cleared between iterations.
+
+    Depth limits start at hop_distance(start, target) and jump straight to
+    the smallest depth + hop_distance that the last iteration cut off.  An
+    iteration that cuts nothing off has seen every reachable cell, so the
+    search stops there instead of deepening up to ROWS*COLS.
+    """
+    start, target = _endpoints(start, target)
+    nbr_count, nbr_node, _ = neighbor_table()
+    s, t   = node_id(*start), node_id(*target)
+    tr, tc = divmod(t, COLS)
+    stamp  = array('i', [-1]) * (ROWS * COLS)
+    best   = array('i', [0]) * (ROWS * COLS)
+
+    limit     = hop_distance(s, t)
+    iteration = 0
+    while True:
+        yield EV_LIMIT, None, limit
+        next_limit = None
+
+        stamp[s], best[s] = iteration, 0
+        path   = [s]
+        cursor = [s * NBR_STRIDE]
+        yield EV_EXPAND, s, 0
+        if s == t:
+            yield EV_FOUND, [start], 0.0
+            return
+
+        while path:
+            u     = path[-1]
+            depth = len(path)              # depth of u's children
+            k     = cursor[-1]
+            end   = u * NBR_STRIDE + nbr_count[u]
+            while k < end:
+                v  = nbr_node[k]
+                k += 1
+                if stamp[v] == iteration and best[v] <= depth:
+                    continue
+                vr, vc = divmod(v, COLS)
+                dr, dc = tr - vr, tc - vc
+                bound  = depth + (max(abs(dr), abs(dc)) if dr * dc >= 0
+                                  else abs(dr) + abs(dc))
+                if bound > limit:
+                    if next_limit is None or bound < next_limit:
+                        next_limit = bound
+                    continue
+                break
+            else:
+                path.pop()
+                cursor.pop()
+                continue
 
-    draw_grid(canvas, status="IDDFS – No path found ✗")
-    canvas.update()
-    return None
+            cursor[-1] = k
+            stamp[v], best[v] = iteration, depth
+            path.append(v)
+            cursor.append(v * NBR_STRIDE)
+            yield EV_EXPAND, v, depth
+
+            if v == t:
+                cells = [cell_of(n) for n in path]
+                yield EV_FOUND, cells, path_cost(cells)
+                return
+
+        if next_limit is None:
+            break
+        limit      = next_limit
+        iteration += 1
+
+    yield EV_FAIL, None, None
 
 
 # ──────────────────────────────────────────
 #  UCS
 # ──────────────────────────────────────────
 
-def ucs(canvas):
-    counter  = 0
-    pq       = [(0.0, counter, [START])]
-    explored = set()
-    best_cost = {START: 0.0}
+def ucs_search(start=None, target=None, store=None, full=False):
+    start, target = _endpoints(start, target)
+    if store is None:
+        store = NodeStore()
+    visited = store.visited
+    parent  = store.parent
+    g       = store.g
+    s       = node_id(*start)
+    t       = -1 if full else node_id(*target)
+    nbr_count, nbr_node, nbr_cost = neighbor_table()
+
+    # Keys are the g-costs themselves; improved costs use decrease-key,
+    # so the heap never holds stale duplicates.
+    frontier   = IndexedHeap(g)
+    frontier.push(s, 0.0)
+    visited[s] = FRONTIER
+
+    while frontier:
+        current = frontier.pop()
+        cost    = g[current]
+        visited[current] = EXPLORED
+        yield EV_EXPAND, current, cost
+
+        if current == t:
+            yield EV_FOUND, store.path_to(t), cost
+            return
+
+        base = current * NBR_STRIDE
+        end  = base + nbr_count[current]
+        for v, move_cost in zip(nbr_node[base:end], nbr_cost[base:end]):
+            if visited[v] != EXPLORED:
+                new_cost = cost + move_cost
+                if new_cost < g[v]:
+                    parent[v]  = current
+                    visited[v] = FRONTIER
+                    frontier.push(v, new_cost)
+                    yield EV_PUSH, v, new_cost
+
+    yield EV_FAIL, None, None
 
-    while pq:
-        cost, _, path = heapq.heappop(pq)
-        current       = path[-1]
 
-        if current in explored:
+# ──────────────────────────────────────────
+#  UCS – bucket queue (Dial's algorithm)
+#  Only two move costs exist, so path costs are kept as integers in units
+#  of 1/COST_SCALE and the frontier is a ring of (largest move + 1)
+#  buckets indexed by cost modulo the ring size.  Every queued cost lies
+#  within one move of the current one, so the ring never wraps onto live
+#  entries.  Push is a list append; pop jumps to the next non-empty
+#  bucket through a bitmap of occupied buckets (one int, lowest set bit),
+#  so long runs of empty buckets – a corridor maze costs thousands of
+#  units per expansion – are skipped in one step instead of scanned.
+# ──────────────────────────────────────────
+
+COST_SCALE = 1000        # DIAG_COST has three decimals
+
+
+def dial_search(start=None, target=None, store=None, full=False):
+    start, target = _endpoints(start, target)
+    if store is None:
+        store = NodeStore()
+    visited = store.visited
+    parent  = store.parent
+    g       = store.g
+    s       = node_id(*start)
+    t       = -1 if full else node_id(*target)
+    nbr_count, nbr_node, nbr_cost = neighbor_table()
+
+    straight = COST_SCALE
+    diagonal = round(DIAG_COST * COST_SCALE)
+    ring     = max(straight, diagonal) + 1
+    buckets  = [[] for _ in range(ring)]
+    units    = array('q', [-1]) * (ROWS * COLS)
+
+    units[s]   = 0
+    g[s]       = 0.0
+    visited[s] = FRONTIER
+    buckets[0].append(s)
+    occupied = 1         # bit i set <=> buckets[i] is non-empty
+    pending  = 1
+    cur      = 0
+
+    while pending:
+        slot   = cur % ring
+        bucket = buckets[slot]
+        if not bucket:
+            ahead = occupied >> slot
+            if ahead:
+                step = (ahead & -ahead).bit_length() - 1
+            else:
+                step = ring - slot + (occupied & -occupied).bit_length() - 1
+            cur   += step
+            slot   = cur % ring
+            bucket = buckets[slot]
+        current  = bucket.pop()
+        pending -= 1
+        if not bucket:
+            occupied ^= 1 << slot
+
+        if visited[current] == EXPLORED or units[current] != cur:
+            yield EV_DISCARD, current, cur / COST_SCALE
             continue
-        explored.add(current)
-
-        frontier = {entry[2][-1] for entry in pq}
-        draw_grid(canvas,
-                  frontier=frontier,
-                  explored=explored,
-                  status=f"UCS – exploring {current}  cost={cost:.2f}")
-        canvas.update()
-        time.sleep(STEP_DELAY)
-
-        if current == TARGET:
-            draw_grid(canvas, path=set(path),
-                      status=f"UCS – Path Found! ✓  Total cost = {cost:.2f}")
-            canvas.update()
-            return path
-
-        row, col = current
-        for r, c, move_cost in get_neighbors(row, col):
-            if (r, c) not in explored:
+        visited[current] = EXPLORED
+        cost = g[current]
+        yield EV_EXPAND, current, cost
+
+        if current == t:
+            yield EV_FOUND, store.path_to(t), cost
+            return
+
+        base = current * NBR_STRIDE
+        end  = base + nbr_count[current]
+        for v, move_cost in zip(nbr_node[base:end], nbr_cost[base:end]):
+            if visited[v] != EXPLORED:
+                new_units = cur + (straight if move_cost == 1.0 else diagonal)
+                old_units = units[v]
+                if old_units < 0 or new_units < old_units:
+                    units[v]   = new_units
+                    g[v]       = cost + move_cost
+                    parent[v]  = current
+                    visited[v] = FRONTIER
+                    slot = new_units % ring
+                    if not buckets[slot]:
+                        occupied |= 1 << slot
+                    buckets[slot].append(v)
+                    pending += 1
+                    yield EV_PUSH, v, g[v]
+
+    yield EV_FAIL, None, None
+
+
+# ──────────────────────────────────────────
+#  A*  (informed UCS)
+#  Same store, neighbour table and indexed heap as UCS, but the frontier is
+#  ordered by g + weight × h with h = cost_distance to the target.  With
+#  weight 1 the path is optimal; a larger weight trades cost (at most
+#  weight × optimal) for far fewer expansions.  Among equal keys the
+#  deeper node goes first: every cost is a multiple of 1/COST_SCALE, so a
+#  bias of under half that step reorders ties and nothing else.
+# ──────────────────────────────────────────
+
+def astar_search(start=None, target=None, weight=1.0):
+    start, target = _endpoints(start, target)
+    if weight < 1:
+        raise ValueError(f"A* weight must be at least 1, got {weight}")
+    store   = NodeStore()
+    visited = store.visited
+    parent  = store.parent
+    g       = store.g
+    s, t    = node_id(*start), node_id(*target)
+    nbr_count, nbr_node, nbr_cost = neighbor_table()
+
+    # Largest g is below DIAG_COST per cell, so tie * g stays under half
+    # a cost step.
+    tie      = 0.5 / COST_SCALE / (DIAG_COST * ROWS * COLS + 1)
+    key      = array('d', [INF]) * len(g)
+    frontier = IndexedHeap(key)
+    g[s]     = 0.0
+    frontier.push(s, weight * cost_distance(s, t))
+    visited[s] = FRONTIER
+
+    while frontier:
+        current = frontier.pop()
+        cost    = g[current]
+        visited[current] = EXPLORED
+        yield EV_EXPAND, current, cost
+
+        if current == t:
+            yield EV_FOUND, store.path_to(t), cost
+            return
+
+        base = current * NBR_STRIDE
+        end  = base + nbr_count[current]
+        for v, move_cost in zip(nbr_node[base:end], nbr_cost[base:end]):
+            if visited[v] != EXPLORED:
                 new_cost = cost + move_cost
-                if new_cost < best_cost.get((r, c), float('inf')):
-                    best_cost[(r, c)] = new_cost
-                    counter += 1
-                    heapq.heappush(pq, (new_cost, counter, path + [(r, c)]))
+                if new_cost < g[v]:
+                    g[v]       = new_cost
+                    parent[v]  = current
+                    visited[v] = FRONTIER
+                    frontier.push(v, new_cost * (1 - tie) + weight * cost_distance(v, t))
+                    yield EV_PUSH, v, new_cost
 
-    draw_grid(canvas, status="UCS – No path found ✗")
-    canvas.update()
-    return None
+    yield EV_FAIL, None, None
 
 
 # ──────────────────────────────────────────
 #  BIDIRECTIONAL SEARCH
 # ──────────────────────────────────────────
 
-def bidirectional(canvas):
-    fwd_queue    = deque([START])
-    bwd_queue    = deque([TARGET])
-    fwd_frontier = {START}
-    bwd_frontier = {TARGET}
-    fwd_explored = {START: None}
-    bwd_explored = {TARGET: None}
-
-    def reconstruct(meet_node):
-        fwd_half = []
-        node = meet_node
-        while node is not None:
-            fwd_half.append(node)
-            node = fwd_explored.get(node)
-        fwd_half.reverse()
-
-        bwd_half = []
-        node = bwd_explored.get(meet_node)
-        while node is not None:
-            bwd_half.append(node)
-            node = bwd_explored.get(node)
-        bwd_half.append(TARGET)
-
-        return fwd_half + bwd_half
-
-    meet_node = None
-
-    while fwd_queue or bwd_queue:
-
-        # ── Forward step ──────────────────────────────────────────────
-        if fwd_queue:
-            current = fwd_queue.popleft()
-            fwd_frontier.discard(current)
-
-            draw_grid_bidir(canvas,
-                            fwd_frontier=fwd_frontier.copy(),
-                            bwd_frontier=bwd_frontier.copy(),
-                            fwd_explored=set(fwd_explored),
-                            bwd_explored=set(bwd_explored),
-                            status=f"Bidir – FWD exploring {current}")
-            canvas.update()
-            time.sleep(STEP_DELAY)
-
-            if current in bwd_explored:
-                meet_node = current
-                break
-
-            row, col = current
-            for r, c, _ in get_neighbors(row, col):
-                if (r, c) not in fwd_explored and (r, c) not in fwd_frontier:
-                    fwd_explored[(r, c)] = current
-                    fwd_frontier.add((r, c))
-                    fwd_queue.append((r, c))
-
-        # ── Backward step ─────────────────────────────────────────────
-        if bwd_queue:
-            current = bwd_queue.popleft()
-            bwd_frontier.discard(current)
-
-            draw_grid_bidir(canvas,
-                            fwd_frontier=fwd_frontier.copy(),
-                            bwd_frontier=bwd_frontier.copy(),
-                            fwd_explored=set(fwd_explored),
-                            bwd_explored=set(bwd_explored),
-                            status=f"Bidir – BWD exploring {current}")
-            canvas.update()
-            time.sleep(STEP_DELAY)
-
-            if current in fwd_explored:
-                meet_node = current
-                break
+# Moves that lead *into* a cell, for the backward halves below.
+# DIRECTIONS is closed under negation (Up/Bottom, Right/Left and the two
+# diagonals), so a cell's predecessors are its neighbours and the backward
+# searches share the neighbour table; predecessor_table() only builds a
+# separate one if the move set ever stops being symmetric.
+REVERSE_DIRECTIONS = [(-dr, -dc) for dr, dc in DIRECTIONS]
+SYMMETRIC_MOVES    = sorted(REVERSE_DIRECTIONS) == sorted(DIRECTIONS)
+
+
+def predecessor_table():
+    """Like neighbor_table(), but listing the cells that can move *into* u
+    with the cost of that move."""
+    if SYMMETRIC_MOVES:
+        return neighbor_table()
+    size      = ROWS * COLS
+    nbr_count = bytearray(size)
+    nbr_node  = array('i', [-1]) * (size * NBR_STRIDE)
+    nbr_cost  = array('d', [0.0]) * (size * NBR_STRIDE)
+    for u in range(size):
+        row, col = divmod(u, COLS)
+        k = u * NBR_STRIDE
+        for dr, dc in REVERSE_DIRECTIONS:
+            r, c = row + dr, col + dc
+            if 0 <= r < ROWS and 0 <= c < COLS and grid[r * COLS + c] == 0:
+                nbr_node[k] = r * COLS + c
+                nbr_cost[k] = DIAG_COST if (-dr, -dc) in DIAG_PAIRS else 1.0
+                k += 1
+        nbr_count[u] = k - u * NBR_STRIDE
+    return nbr_count, nbr_node, nbr_cost
+
+
+def _join_halves(fwd, bwd, meet_fwd, meet_bwd):
+    """Forward tree path to meet_fwd, then the backward tree path from
+    meet_bwd (the same cell, or its successor) to the target."""
+    bwd_half = bwd.path_to(meet_bwd)
+    bwd_half.reverse()
+    if meet_fwd == meet_bwd:
+        bwd_half = bwd_half[1:]
+    return fwd.path_to(meet_fwd) + bwd_half
+
+
+def bidirectional_search(start=None, target=None):
+    """Bidirectional BFS that always grows the smaller frontier.
+
+    A whole layer is expanded at a time, and once the two sides touch the
+    layer is still finished so that the meeting with the fewest moves
+    wins: the path has as few moves as the one plain BFS finds.
+    """
+    start, target = _endpoints(start, target)
+    fwd, bwd = NodeStore(), NodeStore()
+    s, t     = node_id(*start), node_id(*target)
+    tables   = (neighbor_table(), predecessor_table())
+
+    fwd_layer, bwd_layer = [s], [t]
+    for store, root in ((fwd, s), (bwd, t)):
+        store.visited[root] = FRONTIER
+        store.g[root]       = 0
+
+    best, meet = (0, (s, s)) if s == t else (INF, None)
+    while fwd_layer and bwd_layer:
+        forward = len(fwd_layer) <= len(bwd_layer)
+        if forward:
+            layer, own, other, flag = fwd_layer, fwd, bwd, 0
+        else:
+            layer, own, other, flag = bwd_layer, bwd, fwd, EV_BWD
+        nbr_count, nbr_node, _ = tables[not forward]
+        visited, parent, depth = own.visited, own.parent, own.g
+        seen, seen_depth       = other.visited, other.g
+
+        next_layer = []
+        for current in layer:
+            visited[current] = EXPLORED
+            d = depth[current]
+            yield EV_EXPAND | flag, current, d
+
+            base = current * NBR_STRIDE
+            for v in nbr_node[base:base + nbr_count[current]]:
+                if seen[v] and d + 1 + seen_depth[v] < best:
+                    best = d + 1 + seen_depth[v]
+                    meet = (current, v) if forward else (v, current)
+                if not visited[v]:
+                    visited[v] = FRONTIER
+                    parent[v]  = current
+                    depth[v]   = d + 1
+                    next_layer.append(v)
+                    yield EV_PUSH | flag, v, d + 1
+
+        if meet is not None:
+            path = _join_halves(fwd, bwd, *meet)
+            yield EV_FOUND, path, path_cost(path)
+            return
+        if forward:
+            fwd_layer = next_layer
+        else:
+            bwd_layer = next_layer
+
+    yield EV_FAIL, None, None
+
+
+def bidirectional_ucs_search(start=None, target=None):
+    """Bidirectional Dijkstra: uniform-cost search from both ends.
+
+    Each step settles the cheapest node of the smaller frontier.  Every
+    edge relaxed into a cell the other side has reached offers a candidate
+    path; the search stops once the two frontier minima add up to at least
+    the best candidate, which is then optimal.
+    """
+    start, target = _endpoints(start, target)
+    fwd, bwd = NodeStore(), NodeStore()
+    s, t     = node_id(*start), node_id(*target)
+    tables   = (neighbor_table(), predecessor_table())
+    heaps    = (IndexedHeap(fwd.g), IndexedHeap(bwd.g))
+    for store, heap, root in ((fwd, heaps[0], s), (bwd, heaps[1], t)):
+        heap.push(root, 0.0)
+        store.visited[root] = FRONTIER
+
+    best, meet = (0.0, (s, s)) if s == t else (INF, None)
+    fwd_heap, bwd_heap = heaps
+    while fwd_heap and bwd_heap:
+        if fwd_heap.top_key() + bwd_heap.top_key() >= best:
+            break
+        forward = len(fwd_heap) <= len(bwd_heap)
+        if forward:
+            frontier, own, other, flag = fwd_heap, fwd, bwd, 0
+        else:
+            frontier, own, other, flag = bwd_heap, bwd, fwd, EV_BWD
+        nbr_count, nbr_node, nbr_cost = tables[not forward]
+        visited, parent, g = own.visited, own.parent, own.g
+        other_g            = other.g
+
+        current = frontier.pop()
+        cost    = g[current]
+        visited[current] = EXPLORED
+        yield EV_EXPAND | flag, current, cost
+
+        base = current * NBR_STRIDE
+        end  = base + nbr_count[current]
+        for v, move_cost in zip(nbr_node[base:end], nbr_cost[base:end]):
+            new_cost = cost + move_cost
+            if new_cost + other_g[v] < best:
+                best = new_cost + other_g[v]
+                meet = (current, v) if forward else (v, current)
+            if visited[v] != EXPLORED and new_cost < g[v]:
+                parent[v]  = current
+                visited[v] = FRONTIER
+                frontier.push(v, new_cost)
+                yield EV_PUSH | flag, v, new_cost
+
+    if meet is None:
+        yield EV_FAIL, None, None
+        return
+    path = _join_halves(fwd, bwd, *meet)
+    yield EV_FOUND, path, path_cost(path)
 
-            row, col = current
-            for r, c, _ in get_neighbors(row, col):
-                if (r, c) not in bwd_explored and (r, c) not in bwd_frontier:
-                    bwd_explored[(r, c)] = current
-                    bwd_frontier.add((r, c))
-                    bwd_queue.append((r, c))
 
-    if meet_node is not None:
-        full_path = reconstruct(meet_node)
-        draw_grid_bidir(canvas,
-                        fwd_explored=set(fwd_explored),
-                        bwd_explored=set(bwd_explored),
-                        path=set(full_path),
-                        meet=meet_node,
-                        status=f"Bidir – Path Found! ✓  meeting={meet_node}  length={len(full_path)}")
-        canvas.update()
-        return full_path
+# ──────────────────────────────────────────
+#  INCREMENTAL REPLANNING  (LPA*)
+#  Lifelong Planning A* with a zero heuristic: uniform-cost search that
+#  keeps its g-values between queries.  rhs[u] is the one-step lookahead
+#  min(g[v] + cost(v, u)) over u's predecessors; cells where g != rhs are
+#  "inconsistent" and queued by min(g, rhs).  A wall edit only changes the
+#  lookahead of the edited cell and its neighbours, so a replan repairs
+#  the part of the search tree that depended on them and nothing else.
+# ──────────────────────────────────────────
 
-    draw_grid_bidir(canvas, fwd_explored=set(fwd_explored), bwd_explored=set(bwd_explored),
-                    status="Bidir – No path found ✗")
-    canvas.update()
-    return None
+class IncrementalPlanner:
+    """START → TARGET planner that survives wall edits between searches.
+
+        planner = IncrementalPlanner()
+        for event in planner.search(): ...      # full search
+        planner.set_wall(4, 5)
+        for event in planner.search(): ...      # repair only
+
+    Any other change to the live grid (reset_grid, set_grid, …) is noticed
+    through grid_hash() and simply starts the planner over.
+    """
+
+    def __init__(self, start=None, target=None):
+        self.start, self.target = _endpoints(start, target)
+        self._reset()
+
+    def _reset(self):
+        size       = ROWS * COLS
+        self.s     = node_id(*self.start)
+        self.t     = node_id(*self.target)
+        self.g     = array('d', [INF]) * size
+        self.rhs   = array('d', [INF]) * size
+        self.key   = array('d', [INF]) * size
+        self.queue = IndexedHeap(self.key)
+        self.rhs[self.s] = 0.0
+        self.queue.push(self.s, 0.0)
+        self.grid_hash = grid_hash()
+
+    def set_wall(self, row, col, wall=True):
+        """Edit the live grid (module set_wall) and queue the cells whose
+        lookahead the edit can change."""
+        if self.grid_hash != grid_hash():
+            self._reset()
+        set_wall(row, col, wall)
+        u = row * COLS + col
+        nbr_count, nbr_node, _ = neighbor_table()
+        base = u * NBR_STRIDE
+        for v in [u, *nbr_node[base:base + nbr_count[u]]]:
+            self._update(v, predecessor_table())
+        self.grid_hash = grid_hash()
+
+    def _update(self, u, preds):
+        """Recompute rhs[u] and (re)queue u if it is inconsistent."""
+        g, rhs = self.g, self.rhs
+        if u != self.s:
+            best = INF
+            if not grid[u]:
+                pred_count, pred_node, pred_cost = preds
+                base = u * NBR_STRIDE
+                end  = base + pred_count[u]
+                for v, move_cost in zip(pred_node[base:end], pred_cost[base:end]):
+                    if g[v] + move_cost < best:
+                        best = g[v] + move_cost
+            rhs[u] = best
+        if g[u] != rhs[u]:
+            self.queue.push(u, min(g[u], rhs[u]))
+            return True
+        self.queue.remove(u)
+        return False
+
+    def search(self):
+        """Bring the plan up to date, yielding the usual search events.
+
+        The first call is a full uniform-cost search; after wall edits
+        only the inconsistent cells are expanded again.
+        """
+        if self.grid_hash != grid_hash():
+            self._reset()
+        g, rhs, key, queue = self.g, self.rhs, self.key, self.queue
+        t      = self.t
+        preds  = predecessor_table()
+        nbr_count, nbr_node, _ = neighbor_table()
+        update = self._update
+
+        while queue and (queue.top_key() < min(g[t], rhs[t]) or g[t] != rhs[t]):
+            u = queue.pop()
+            if g[u] > rhs[u]:
+                g[u] = rhs[u]           # overconsistent: settle, like UCS
+            else:
+                g[u] = INF              # underconsistent: its support is gone
+                if update(u, preds):
+                    yield EV_PUSH, u, key[u]
+            yield EV_EXPAND, u, g[u]
+            base = u * NBR_STRIDE
+            for v in nbr_node[base:base + nbr_count[u]]:
+                if update(v, preds):
+                    yield EV_PUSH, v, key[v]
+
+        if g[t] == INF:
+            yield EV_FAIL, None, None
+            return
+        path = self.path()
+        yield EV_FOUND, path, path_cost(path)
+
+    def path(self):
+        """Current best path, walking cheapest predecessors back from TARGET."""
+        g, u, s = self.g, self.t, self.s
+        pred_count, pred_node, pred_cost = predecessor_table()
+        nodes = [u]
+        while u != s:
+            base = u * NBR_STRIDE
+            end  = base + pred_count[u]
+            u = min(zip(pred_node[base:end], pred_cost[base:end]),
+                    key=lambda pair: g[pair[0]] + pair[1])[0]
+            nodes.append(u)
+        nodes.reverse()
+        return [cell_of(u) for u in nodes]
+
+
+def lpa_search(start=None, target=None):
+    """One LPA* planning run; on its own this is a plain UCS."""
+    yield from IncrementalPlanner(start, target).search()
 
 
 # ──────────────────────────────────────────
-#  RUN BUTTON CALLBACK
+#  SEARCH API  (headless)
 # ──────────────────────────────────────────
 
-def run_algorithm():
-    reset_grid()
-    draw_grid(canvas, status="Starting…")
-    canvas.update()
-    run_btn.config(state=tk.DISABLED)
-    root.update()
+SEARCHES = {
+    "BFS"      : bfs_search,
+    "BFS-Bits" : bitboard_search,
+    "DFS"      : dfs_search,
+    "UCS"      : ucs_search,
+    "UCS-Dial" : dial_search,
+    "A*"       : astar_search,
+    "DLS"      : dls_search,
+    "IDDFS"    : iddfs_search,
+    "Bidir"    : bidirectional_search,
+    "Bidir-UCS": bidirectional_ucs_search,
+    "LPA*"     : lpa_search,
+}
 
-    algo = algo_var.get()
+# Searches that run a backward half and tag its events with EV_BWD
+BIDIRECTIONAL = {"Bidir", "Bidir-UCS"}
+
+
+def search(algo, start=None, target=None, **options):
+    """Return the event generator for `algo` (a key of SEARCHES).
+
+    start/target default to the current START/TARGET.  Extra keyword
+    options are passed through, e.g. limit=… for DLS.  A target outside
+    start's component fails at once, without searching.
+    """
+    start, target = _endpoints(start, target)
+    if not reachable(start, target):
+        return iter([(EV_FAIL, None, None)])
+    return SEARCHES[algo](start, target, **options)
+
+
+def solve(algo, start=None, target=None, stats=None, cache=True, recorder=None, **options):
+    """Run a search to completion at full speed and summarise it.
+
+    Pass a SearchStats as `stats` to have the run counted and timed, and a
+    tracefile.TraceRecorder as `recorder` to record its event stream.
+    Other BFS / UCS / UCS-Dial queries are answered from tree_cache, so
+    repeated queries from one source search only once; cache=False runs
+    a plain search that stops at the target.
+    """
+    if (cache and stats is None and recorder is None and not options
+            and algo in TREE_SEARCHES):
+        return tree_cache.solve(algo, start, target)
+    events = search(algo, start, target, **options)
+    if stats is not None:
+        events = instrument(events, stats)
+    if recorder is not None:
+        events = _recorded(events, recorder)
+    expanded = 0
+    for kind, node, value in events:
+        if kind & ~EV_BWD == EV_EXPAND:
+            expanded += 1
+        elif kind == EV_FOUND:
+            return {"path": node, "cost": value, "expanded": expanded}
+    return {"path": None, "cost": None, "expanded": expanded}
+
+
+def _recorded(events, recorder):
+    for event in events:
+        recorder.add(*event)
+        yield event
+
+
+# ──────────────────────────────────────────
+#  INSTRUMENTATION
+#  SearchStats counts one run's work from its event stream, so the
+#  engines carry no counters of their own; instrument() threads a stream
+#  through it and times how long the search itself runs.  Consumers add
+#  their own phases (the GUI times its rendering) with stats.phase().
+# ──────────────────────────────────────────
+
+class SearchStats:
+    """Counters and per-phase timers for one search run.
+
+    pushes counts every EV_PUSH; duplicate_pushes those for a node that
+    was already on the frontier (a decrease-key).  stale_pops counts
+    EV_DISCARD, frontier entries popped and dropped unexpanded.  A node
+    expanded again by the same side of the search is a re-expansion:
+    repeated work across IDDFS iterations, or LPA* revisiting a cell.
+    max_frontier is the most nodes pushed and not yet expanded or
+    discarded at any one time, both halves together for Bidir.
+    """
+
+    COUNTERS = ("expansions", "pushes", "duplicate_pushes", "stale_pops",
+                "re_expansions", "iterations", "max_frontier")
+
+    def __init__(self, size=None):
+        size = ROWS * COLS if size is None else size
+        for name in self.COUNTERS:
+            setattr(self, name, 0)
+        self.frontier  = 0
+        self.timers    = {}
+        self._open     = bytearray(size)    # bit 1 forward, bit 2 backward
+        self._expanded = bytearray(size)
+
+    def observe(self, kind, node, value):
+        side  = 2 if kind & EV_BWD else 1
+        kind &= ~EV_BWD
+        if kind == EV_EXPAND:
+            self.expansions += 1
+            if self._expanded[node] & side:
+                self.re_expansions += 1
+            self._expanded[node] |= side
+        elif kind == EV_PUSH:
+            self.pushes += 1
+            if self._open[node] & side:
+                self.duplicate_pushes += 1
+                return
+            self._open[node] |= side
+            self.frontier += 1
+            if self.frontier > self.max_frontier:
+                self.max_frontier = self.frontier
+            return
+        elif kind == EV_DISCARD:
+            self.stale_pops += 1
+        elif kind == EV_LIMIT:
+            self.iterations += 1
+            self._open[:] = bytes(len(self._open))
+            self.frontier = 0
+            return
+        else:
+            return
+        if self._open[node] & side:         # expanded or discarded: off the frontier
+            self._open[node] &= ~side
+            self.frontier -= 1
+
+    def add_time(self, phase, seconds):
+        self.timers[phase] = self.timers.get(phase, 0.0) + seconds
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        """Time the enclosed block under `name`."""
+        began = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(name, time.perf_counter() - began)
+
+    def as_dict(self):
+        """The counters and timers as a JSON-ready dict."""
+        return {**{name: getattr(self, name) for name in self.COUNTERS},
+                "seconds": {phase: round(t, 6) for phase, t in self.timers.items()}}
+
+    def summary(self):
+        """One status-bar line."""
+        text = (f"expanded={self.expansions}  pushes={self.pushes}"
+                f"  stale={self.stale_pops}  max frontier={self.max_frontier}")
+        if self.re_expansions:
+            text += f"  re-expanded={self.re_expansions}"
+        for phase in sorted(self.timers, key=lambda phase: phase != "search"):
+            text += f"  {phase} {self.timers[phase] * 1000:.0f} ms"
+        return text
+
+
+def instrument(events, stats):
+    """Pass an event stream through, counting it into `stats`.
+
+    Time spent inside the search generator is added to the "search"
+    phase; time the consumer spends between events is not.
+    """
+    clock, observe = time.perf_counter, stats.observe
+    events = iter(events)
+    spent  = 0.0
     try:
-        if   algo == "BFS":   bfs(canvas)
-        elif algo == "DFS":   dfs(canvas)
-        elif algo == "UCS":   ucs(canvas)
-        elif algo == "IDDFS": iddfs(canvas)
-        elif algo == "Bidir": bidirectional(canvas)
-        elif algo == "DLS":
+        while True:
+            began = clock()
             try:
-                limit = int(depth_var.get())
-                if limit < 0:
-                    raise ValueError
-            except ValueError:
-                draw_grid(canvas, status="DLS – Please enter a valid depth limit (integer ≥ 0)")
-                canvas.update()
+                event = next(events)
+            except StopIteration:
                 return
-            dls(canvas, limit)
+            finally:
+                spent += clock() - began
+            observe(*event)
+            yield event
     finally:
-        run_btn.config(state=tk.NORMAL)
+        stats.add_time("search", spent)
+
+
+@contextlib.contextmanager
+def profiling(path):
+    """Run the enclosed block under cProfile and dump its statistics.
+
+    The profile is written to `path` for pstats / snakeviz, or with path
+    "-" the top entries by cumulative time are printed to stderr.
+    cProfile only sees the thread that enters the block.
+    """
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield profiler
+    finally:
+        profiler.disable()
+        if path == "-":
+            pstats.Stats(profiler, stream=sys.stderr).sort_stats("cumulative").print_stats(25)
+        else:
+            profiler.dump_stats(path)
 
 
 # ──────────────────────────────────────────
-#  LEGEND
+#  SEARCH-TREE CACHE
+#  Repeated queries on the same map from the same source share one
+#  single-source search run to exhaustion: its NodeStore (parents and
+#  costs) answers every later target by walking parents, no searching.
 # ──────────────────────────────────────────
 
-def build_legend(parent):
-    frame = tk.Frame(parent, bg="#FAFAFA", bd=1, relief=tk.GROOVE)
-    frame.pack(fill=tk.X, padx=10, pady=(0, 10))
+# Engines that can run with full=True (no target: search the whole
+# component) and fill a caller-supplied store (A* needs a target for its
+# heuristic; without one it is UCS)
+TREE_SEARCHES = {
+    "BFS"      : bfs_search,
+    "UCS"      : ucs_search,
+    "UCS-Dial" : dial_search,
+}
 
-    items = [
-        (COLOR["start"],        "Start (S)"),
-        (COLOR["target"],       "Target (T)"),
-        (COLOR["wall"],         "Static Wall"),
-        (COLOR["fwd_frontier"], "Fwd Frontier"),
-        (COLOR["bwd_frontier"], "Bwd Frontier"),
-        (COLOR["fwd_explored"], "Fwd Explored"),
-        (COLOR["bwd_explored"], "Bwd Explored"),
-        (COLOR["meet"],         "Meeting Node"),
-        (COLOR["path"],         "Final Path"),
-    ]
 
-    for i, (color, label) in enumerate(items):
-        tk.Label(frame, bg=color, width=2,
-                 relief=tk.RAISED).grid(row=0, column=i*2,   padx=(6, 2), pady=5)
-        tk.Label(frame, text=label, bg="#FAFAFA",
-                 font=("Arial", 8)).grid(row=0, column=i*2+1, padx=(0, 8))
+class TreeCache:
+    """LRU cache of finished search trees keyed by (map, source, algo).
+
+    The map part of the key is grid_hash(), so wall edits simply stop old
+    trees from matching.  Least recently used trees are evicted once the
+    stored arrays exceed `budget` bytes.
+    """
+
+    def __init__(self, budget=64 << 20):
+        self.budget = budget
+        self.used   = 0
+        self.trees  = OrderedDict()
+        self.hits   = 0
+        self.misses = 0
+
+    @staticmethod
+    def _nbytes(store):
+        return (len(store.visited)
+                + store.parent.itemsize * len(store.parent)
+                + store.g.itemsize * len(store.g))
+
+    def tree(self, algo, source=None):
+        """NodeStore of a full `algo` search from `source` on the live grid.
+
+        `algo` is a key of TREE_SEARCHES: engines that need a target, such
+        as A*, cannot grow a single-source tree.
+        """
+        if algo not in TREE_SEARCHES:
+            raise ValueError(f"search trees need one of {', '.join(TREE_SEARCHES)}, got {algo!r}")
+        source = START if source is None else tuple(source)
+        key    = (grid_hash(), source, algo)
+        store  = self.trees.get(key)
+        if store is not None:
+            self.hits += 1
+            self.trees.move_to_end(key)
+            return store
+
+        self.misses += 1
+        store = NodeStore()
+        for _ in TREE_SEARCHES[algo](source, store=store, full=True):
+            pass
+        size = self._nbytes(store)
+        if size <= self.budget:
+            self.trees[key] = store
+            self.used      += size
+            while self.used > self.budget:
+                _, old = self.trees.popitem(last=False)
+                self.used -= self._nbytes(old)
+        return store
+
+    def solve(self, algo, start=None, target=None):
+        """Like solve(), but answered from the cached tree for `start`.
+
+        expanded counts the cells the tree search expanded when this query
+        had to build the tree, and is 0 when the tree was already cached.
+        """
+        start  = START if start is None else tuple(start)
+        target = TARGET if target is None else tuple(target)
+        if not reachable(start, target):
+            return {"path": None, "cost": None, "expanded": 0}
+        misses = self.misses
+        store  = self.tree(algo, start)
+        expanded = store.visited.count(EXPLORED) if self.misses > misses else 0
+        t = node_id(*target)
+        if store.visited[t] != EXPLORED:
+            return {"path": None, "cost": None, "expanded": expanded}
+        path = store.path_to(t)
+        cost = path_cost(path) if algo == "BFS" else store.g[t]
+        return {"path": path, "cost": cost, "expanded": expanded}
+
+    def clear(self):
+        self.trees.clear()
+        self.used = 0
+
+
+tree_cache = TreeCache()
 
 
 # ──────────────────────────────────────────
-#  MAIN WINDOW
+#  MULTI-GOAL SEARCH
+#  One single-source search serves a whole set of goals: a tree search
+#  runs with no target and every expanded cell is checked against a goal
+#  mask, one byte per cell, so membership costs O(1) whatever the number
+#  of goals.  Since these engines expand cells in order of distance, the
+#  first goal expanded is the nearest and each goal's path is final the
+#  moment it is expanded.
 # ──────────────────────────────────────────
 
-root = tk.Tk()
-root.title("AI Pathfinder – BFS / DFS / UCS / DLS / IDDFS / Bidir")
-root.resizable(False, False)
-root.configure(bg="#FAFAFA")
+def multi_goal_search(algo, start=None, goals=(), nearest=True):
+    """Event generator for one `algo` search towards every cell in `goals`.
+
+    `algo` is a key of TREE_SEARCHES; distance is its own measure (hops
+    for BFS, move cost otherwise).  With nearest=True the search stops at
+    the first goal it expands and reports it with EV_FOUND.  Otherwise it
+    goes on until every goal is settled: each is reported with EV_GOAL as
+    it is reached, the last one with EV_FOUND.
+
+    Goals outside start's component are dropped up front, so the search
+    never exhausts the component looking for them; with no reachable goal
+    it fails at once.  A goal outside the grid raises ValueError.
+    """
+    if algo not in TREE_SEARCHES:
+        raise ValueError(f"multi-goal search needs one of {', '.join(TREE_SEARCHES)}, got {algo!r}")
+    start     = START if start is None else start
+    mask      = bytearray(ROWS * COLS)
+    remaining = 0
+    for goal in goals:
+        row, col = goal
+        if not (0 <= row < ROWS and 0 <= col < COLS):
+            raise ValueError(f"goal {row},{col} is outside the {ROWS}x{COLS} map")
+        u = node_id(*goal)
+        if not mask[u] and reachable(start, goal):
+            mask[u]    = 1
+            remaining += 1
+    if not remaining:
+        yield EV_FAIL, None, None
+        return
+
+    store = NodeStore()
+    for kind, node, value in TREE_SEARCHES[algo](start, store=store, full=True):
+        yield kind, node, value
+        if kind == EV_EXPAND and mask[node]:
+            mask[node] = 0
+            remaining -= 1
+            path = store.path_to(node)
+            cost = path_cost(path) if algo == "BFS" else value
+            if nearest or not remaining:
+                yield EV_FOUND, path, cost
+                return
+            yield EV_GOAL, path, cost
+
+
+def solve_goals(algo, start=None, goals=(), nearest=True):
+    """Run multi_goal_search to completion and summarise it.
 
-# Title label inside window
-tk.Label(root, text="AI Pathfinder – Uninformed Search",
-         font=("Arial", 15, "bold"), bg="#FAFAFA").pack(pady=(10, 2))
+    "found" maps each goal reached, as a (row, col) tuple, to its path and
+    cost; goals missing from it are unreachable from start (or, with
+    nearest=True, simply not the nearest).
+    """
+    found, expanded = {}, 0
+    for kind, node, value in multi_goal_search(algo, start, goals, nearest):
+        if kind == EV_EXPAND:
+            expanded += 1
+        elif kind in (EV_GOAL, EV_FOUND):
+            found[node[-1]] = {"path": node, "cost": value}
+    return {"found": found, "expanded": expanded}
 
-tk.Label(root,
-         text="Visualizing search step-by-step on a static grid",
-         font=("Arial", 9, "italic"), fg="#888888", bg="#FAFAFA").pack(pady=(0, 6))
 
-# Canvas  (extra 30 px for status bar)
-canvas = tk.Canvas(root,
-                   width=COLS * CELL_SIZE,
-                   height=ROWS * CELL_SIZE + 30,
-                   bg="#FAFAFA", bd=0, highlightthickness=0)
-canvas.pack(padx=10)
+# ──────────────────────────────────────────
+#  MAP FILES  (text; binary maps live in mapfile.py)
+#  One line per row: '#' / '1' wall, '.' / '0' / ' ' open,
+#  'S' / 'T' open cells marking start and target.
+# ──────────────────────────────────────────
 
-# Controls row
-ctrl = tk.Frame(root, bg="#FAFAFA")
-ctrl.pack(pady=8)
+MAP_WALLS = "#1"
+MAP_OPEN  = ".0 ST"
+
+# Map characters → cell bytes; anything left over is rejected
+MAP_CELLS = str.maketrans({**{ch: "\x01" for ch in MAP_WALLS},
+                           **{ch: "\x00" for ch in MAP_OPEN}})
+
+
+def read_map(path):
+    """Parse a text map: returns (cells, rows, cols, start, target)."""
+    with open(path, encoding="utf-8") as fh:
+        lines = [line.rstrip("\r\n") for line in fh]
+    while lines and not lines[-1].strip():
+        lines.pop()
+    if not lines:
+        raise ValueError(f"{path}: empty map")
+
+    rows, cols   = len(lines), max(len(line) for line in lines)
+    cells        = bytearray()
+    start = target = None
+    for r, line in enumerate(lines):
+        line = line.ljust(cols)
+        row  = line.translate(MAP_CELLS)
+        bad  = row.strip("\x00\x01")
+        if bad:
+            raise ValueError(f"{path}:{r + 1}: unexpected {bad[0]!r}")
+        if "S" in line:
+            start = (r, line.index("S"))
+        if "T" in line:
+            target = (r, line.index("T"))
+        cells += row.encode("latin-1")
+    return cells, rows, cols, start, target
+
+
+def load_map(path):
+    """Make a map file the live grid: text, or binary (see mapfile.py).
+
+    A binary byte-per-cell map is used straight from its memory mapping.
+    """
+    import mapfile
+    if not mapfile.is_binary(path):
+        set_grid(*read_map(path))
+        return
+    binary = mapfile.MapFile(path)
+    if binary.packed:
+        set_grid(binary.unpack(), binary.rows, binary.cols, binary.start, binary.target)
+    else:
+        attach_grid(binary.cells, binary.rows, binary.cols, binary.start, binary.target)
+
+
+def random_map(rows, cols, density=0.25, seed=None):
+    """Scatter walls at random: returns (cells, rows, cols, start, target).
+
+    START and TARGET sit in the top-left and bottom-right corners and are
+    always open.  The same seed always gives the same map.
+    """
+    rng   = random.Random(seed)
+    cells = bytearray(rng.random() < density for _ in range(rows * cols))
+    cells[0] = cells[-1] = 0
+    return cells, rows, cols, (0, 0), (rows - 1, cols - 1)
 
-tk.Label(ctrl, text="Algorithm:", bg="#FAFAFA",
-         font=("Arial", 11)).grid(row=0, column=0, padx=6)
 
-algo_var = tk.StringVar(root)
-algo_var.set("BFS")
-tk.OptionMenu(ctrl, algo_var, "BFS", "DFS", "UCS", "DLS", "IDDFS", "Bidir").grid(row=0, column=1, padx=6)
+# ──────────────────────────────────────────
+#  COMMAND LINE
+#  python Pathfinder.py                      → GUI
+#  python Pathfinder.py --no-gui --algo UCS  → JSON on stdout
+#  python Pathfinder.py --no-gui --algo UCS,A*  → one JSON object per algo
+# ──────────────────────────────────────────
 
-# Depth limit row (DLS only)
-depth_frame = tk.Frame(root, bg="#FAFAFA")
-depth_frame.pack(pady=(0, 4))
-tk.Label(depth_frame, text="Depth Limit (DLS):", bg="#FAFAFA",
-         font=("Arial", 10)).grid(row=0, column=0, padx=6)
-depth_var = tk.StringVar(root)
-depth_var.set("15")
-depth_entry = tk.Entry(depth_frame, textvariable=depth_var, width=5,
-                       font=("Arial", 11), justify="center")
-depth_entry.grid(row=0, column=1, padx=4)
-tk.Label(depth_frame, text="(used by DLS only)", bg="#FAFAFA",
-         font=("Arial", 9), fg="#888888").grid(row=0, column=2, padx=6)
+def _cell_arg(text):
+    try:
+        row, col = (int(part) for part in text.split(","))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected ROW,COL, got {text!r}")
+    return row, col
 
-run_btn = tk.Button(ctrl, text="▶  Run Search",
-                    command=run_algorithm,
-                    bg="#2980B9", fg="white",
-                    font=("Arial", 11, "bold"),
-                    relief=tk.FLAT, padx=12, pady=4)
-run_btn.grid(row=0, column=2, padx=10)
 
-# Legend
-build_legend(root)
+def _check_cell(parser, option, cell):
+    """parser.error() unless `cell` is an open cell of the loaded map."""
+    row, col = cell
+    if not (0 <= row < ROWS and 0 <= col < COLS):
+        parser.error(f"{option} {row},{col} is outside the {ROWS}x{COLS} map")
+    if grid[row * COLS + col]:
+        parser.error(f"{option} {row},{col} is a wall")
 
-# Initial draw
-draw_grid(canvas, status="Select an algorithm and press ▶ Run Search")
 
-root.mainloop()
+def _size_arg(text):
+    try:
+        rows, cols = (int(part) for part in text.lower().split("x"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected ROWSxCOLS, got {text!r}")
+    if rows < 1 or cols < 1:
+        raise argparse.ArgumentTypeError(f"map size must be positive, got {text!r}")
+    return rows, cols
+
+
+def _goals_arg(text):
+    return [_cell_arg(part) for part in text.split(";") if part.strip()]
+
+
+def _algos_arg(text):
+    algos = text.split(",")
+    for algo in algos:
+        if algo not in SEARCHES:
+            raise argparse.ArgumentTypeError(
+                f"unknown algorithm {algo!r} (choose from {', '.join(SEARCHES)})")
+    return algos
+
+
+def run_goals_cli(args, algo):
+    """Run one headless multi-goal search as a JSON-ready dict."""
+    began   = time.perf_counter()
+    result  = solve_goals(algo, args.start, args.goals, nearest=not args.all_goals)
+    elapsed = time.perf_counter() - began
+    goals   = []
+    for goal in args.goals:
+        hit = result["found"].get(tuple(goal))
+        goals.append({
+            "goal"   : list(goal),
+            "found"  : hit is not None,
+            "path"   : [list(cell) for cell in hit["path"]] if hit else None,
+            "length" : len(hit["path"]) if hit else None,
+            "cost"   : round(hit["cost"], 6) if hit else None,
+        })
+    return {
+        "algo"     : algo,
+        "map"      : args.map,
+        "rows"     : ROWS,
+        "cols"     : COLS,
+        "start"    : list(args.start or START),
+        "mode"     : "all" if args.all_goals else "nearest",
+        "goals"    : goals,
+        "expanded" : result["expanded"],
+        "seconds"  : round(elapsed, 6),
+    }
+
+
+def run_cli(args, algo):
+    """Run one headless search and describe it as a JSON-ready dict."""
+    options = {}
+    if algo == "DLS":
+        options["limit"] = args.limit
+    elif algo == "A*":
+        options["weight"] = args.weight
+    stats    = SearchStats() if args.stats else None
+    recorder = None
+    if args.trace:
+        import tracefile
+        recorder = tracefile.TraceRecorder(algo, options, args.start, args.target)
+    began   = time.perf_counter()
+    result  = solve(algo, args.start, args.target, stats, cache=False,
+                    recorder=recorder, **options)
+    elapsed = time.perf_counter() - began
+    path    = result["path"]
+    summary = {
+        "algo"     : algo,
+        "map"      : args.map,
+        "rows"     : ROWS,
+        "cols"     : COLS,
+        "start"    : list(args.start or START),
+        "target"   : list(args.target or TARGET),
+        "found"    : path is not None,
+        "path"     : [list(cell) for cell in path] if path else None,
+        "length"   : len(path) if path else None,
+        "cost"     : round(result["cost"], 6) if path else None,
+        "expanded" : result["expanded"],
+        "seconds"  : round(elapsed, 6),
+    }
+    if stats is not None:
+        summary["stats"] = stats.as_dict()
+    if recorder is not None:
+        recorder.save(args.trace)
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Grid pathfinding: Tk visualiser or headless JSON runs.")
+    parser.add_argument("--algo", default=["BFS"], type=_algos_arg, metavar="ALGO[,ALGO…]",
+                        help=f"one of {', '.join(SEARCHES)}; with --no-gui a comma"
+                             " list runs each on the same query")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--map", help="text or binary map file (default: built-in 10x10)")
+    source.add_argument("--random", type=_size_arg, metavar="ROWSxCOLS",
+                        help="random map of this size instead of a file")
+    parser.add_argument("--density", type=float, default=0.25,
+                        help="wall density for --random")
+    parser.add_argument("--seed", type=int, help="random seed for --random")
+    parser.add_argument("--start", type=_cell_arg, help="ROW,COL")
+    parser.add_argument("--target", type=_cell_arg, help="ROW,COL")
+    parser.add_argument("--goals", type=_goals_arg, metavar="ROW,COL;ROW,COL…",
+                        help="with --no-gui, search for the nearest of several targets"
+                             f" in one pass ({', '.join(TREE_SEARCHES)})")
+    parser.add_argument("--all-goals", action="store_true",
+                        help="with --goals, go on until every goal has its path")
+    parser.add_argument("--limit", type=int, default=15, help="depth limit for DLS")
+    parser.add_argument("--weight", type=float, default=1.0,
+                        help="heuristic weight for A* (> 1: faster, cost ≤ weight × optimal)")
+    parser.add_argument("--no-gui", action="store_true",
+                        help="search headlessly and print JSON")
+    parser.add_argument("--stats", action="store_true",
+                        help="with --no-gui, add search counters and timers to the JSON")
+    parser.add_argument("--trace", metavar="FILE",
+                        help="with --no-gui, record the search as a trace file"
+                             " (see tracefile.py) for replay in the GUI")
+    parser.add_argument("--profile", metavar="FILE",
+                        help="run under cProfile and dump the stats to FILE"
+                             " ('-' prints a summary to stderr)")
+    args = parser.parse_args(argv)
+    if args.weight < 1:
+        parser.error(f"--weight must be at least 1, got {args.weight}")
+    if args.trace and len(args.algo) > 1:
+        parser.error("--trace records a single algorithm")
+    if args.goals is not None:
+        if args.target or args.trace or args.stats:
+            parser.error("--goals replaces --target and cannot be used with --trace or --stats")
+        for algo in args.algo:
+            if algo not in TREE_SEARCHES:
+                parser.error(f"--goals needs one of {', '.join(TREE_SEARCHES)}, got {algo!r}")
+
+    if args.map:
+        load_map(args.map)
+    elif args.random:
+        set_grid(*random_map(*args.random, args.density, args.seed))
+    for option, cells in (("--start", [args.start]), ("--target", [args.target]),
+                          ("--goals", args.goals or [])):
+        for cell in cells:
+            if cell is not None:
+                _check_cell(parser, option, cell)
+
+    if args.no_gui:
+        with profiling(args.profile) if args.profile else contextlib.nullcontext():
+            run  = run_cli if args.goals is None else run_goals_cli
+            runs = [run(args, algo) for algo in args.algo]
+        json.dump(runs[0] if len(runs) == 1 else runs, sys.stdout)
+        sys.stdout.write("\n")
+        return 0
+
+    import gui
+    gui.main(args.algo[0], args.profile)
+    return 0
+
+
+if __name__ == "__main__":
+    # gui, tracefile and the rest import this file as Pathfinder: make that
+    # name this module, so they all see the map main() loads.
+    sys.modules["Pathfinder"] = sys.modules[__name__]
+    sys.exit(main())
@@ -0,0 +1,143 @@
+"""Batch pathfinding: many (start, target) queries on one map, in parallel.
+
+The live grid, its neighbour table and its reachability labels are built
+once in the parent and placed in a single shared-memory block.  Worker
+processes map that block at start-up (Pathfinder.adopt_grid) so nothing
+grid-sized is pickled per task; only query tuples and results travel
+between processes.
+
+    import Pathfinder, batch
+    Pathfinder.load_map("maps/example.txt")
+    for index, result in batch.solve_batch("UCS", [((0, 0), (9, 9)), ...]):
+        ...
+"""
+import atexit
+import contextlib
+import functools
+import multiprocessing as mp
+import os
+from multiprocessing import shared_memory
+
+import Pathfinder as pf
+
+DEFAULT_CHUNK = 64          # queries per task
+
+
+def _layout(size):
+    """Byte offsets of each array inside the shared block."""
+    grid_at   = 0
+    count_at  = size
+    label_at  = (2 * size + 7) // 8 * 8
+    node_at   = label_at + 4 * size
+    cost_at   = node_at + 4 * size * pf.NBR_STRIDE
+    end       = cost_at + 8 * size * pf.NBR_STRIDE
+    return grid_at, count_at, label_at, node_at, cost_at, end
+
+
+def _share_live_grid():
+    """Copy the live grid and its indexes into a new SharedMemory block."""
+    size = pf.ROWS * pf.COLS
+    nbr_count, nbr_node, nbr_cost = pf.neighbor_table()
+    labels = pf.reachability().label
+    grid_at, count_at, label_at, node_at, cost_at, end = _layout(size)
+
+    shm = shared_memory.SharedMemory(create=True, size=end)
+    buf = shm.buf
+    buf[grid_at:grid_at + size]  = pf.grid[:size]
+    buf[count_at:count_at + size] = nbr_count
+    buf[label_at:node_at]        = labels.tobytes()
+    buf[node_at:cost_at]         = nbr_node.tobytes()
+    buf[cost_at:end]             = nbr_cost.tobytes()
+    return shm
+
+
+# ──────────────────────────────────────────
+#  WORKER SIDE
+# ──────────────────────────────────────────
+
+_worker_shm   = None        # the block, mapped for the life of the worker
+_worker_views = []          # views on it that Pathfinder.adopt_grid holds
+
+
+def _init_worker(name, rows, cols):
+    global _worker_shm
+    # Spawned workers share the parent's resource tracker, so attaching
+    # here does not hand ownership of the block to this process.
+    _worker_shm = shared_memory.SharedMemory(name=name)
+    atexit.register(_release_worker)
+    size = rows * cols
+    grid_at, count_at, label_at, node_at, cost_at, end = _layout(size)
+    buf = _worker_shm.buf
+    _worker_views[:] = [buf[grid_at:grid_at + size],
+                        buf[count_at:count_at + size],
+                        buf[node_at:cost_at].cast('i'),
+                        buf[cost_at:end].cast('d'),
+                        buf[label_at:node_at].cast('i')]
+    cells, nbr_count, nbr_node, nbr_cost, labels = _worker_views
+    pf.adopt_grid(cells, rows, cols, (nbr_count, nbr_node, nbr_cost), labels)
+
+
+def _release_worker():
+    """Release the adopted grid's views so the block can be unmapped.
+
+    SharedMemory refuses to close while views on it exist, and left to
+    its finaliser at interpreter exit it would only report the failure.
+    """
+    for view in _worker_views:
+        view.release()
+    _worker_views.clear()
+    _worker_shm.close()
+
+
+def _solve_chunk(algo, options, chunk):
+    return [(index, pf.solve(algo, start, target, **options))
+            for index, start, target in chunk]
+
+
+# ──────────────────────────────────────────
+#  PARENT SIDE
+# ──────────────────────────────────────────
+
+def solve_batch(algo, queries, workers=None, chunk=DEFAULT_CHUNK, **options):
+    """Solve every (start, target) pair on the live grid in parallel.
+
+    Yields (index, result) as chunks complete – not in input order –
+    where index is the query's position in `queries` and result is the
+    dict returned by Pathfinder.solve().  `workers` defaults to the CPU
+    count; workers=0 runs everything in this process instead.
+    """
+    # Queries from one source go to the same chunks, so a worker builds
+    # that source's search tree once (Pathfinder.tree_cache) for all of them.
+    tasks = sorted(((i, tuple(start), tuple(target))
+                    for i, (start, target) in enumerate(queries)),
+                   key=lambda task: task[1])
+    chunks = [tasks[i:i + chunk] for i in range(0, len(tasks), chunk)]
+
+    if workers == 0:
+        for part in chunks:
+            yield from _solve_chunk(algo, options, part)
+        return
+
+    with shared_pool(workers) as pool:
+        solve_part = functools.partial(_solve_chunk, algo, options)
+        for results in pool.imap_unordered(solve_part, chunks):
+            yield from results
+
+
+@contextlib.contextmanager
+def shared_pool(workers=None):
+    """A process pool whose workers all map the live grid.
+
+    Workers share the grid, neighbour table and reachability labels but
+    not START / TARGET: tasks must pass their own start and target.
+    `workers` defaults to the CPU count.
+    """
+    shm = _share_live_grid()
+    try:
+        ctx = mp.get_context("spawn")
+        with ctx.Pool(workers or os.cpu_count(), initializer=_init_worker,
+                      initargs=(shm.name, pf.ROWS, pf.COLS)) as pool:
+            yield pool
+    finally:
+        shm.close()
+        shm.unlink()
@@ -0,0 +1,366 @@
+"""Benchmark every search engine on seeded maps and compare against a baseline.
+
+Maps are generated from a seed, so the same command always benchmarks
+the same grids:
+
+    random   walls scattered at each --densities value
+    open     an open field (no walls)
+    maze     a perfect maze carved by a randomised depth-first walk
+    rooms    a grid of rooms joined by doors
+
+Each engine runs headlessly on each map from the top-left to the
+bottom-right open corner.  Wall time is the best of --repeat plain runs;
+a separate run, counted by Pathfinder.SearchStats, gives the peak
+frontier size and measures the peak Python heap with tracemalloc, so the
+instrumentation never lands in the timings.
+
+    python benchmark.py --sizes 64,256 --save base.json
+    python benchmark.py --sizes 64,256 --baseline base.json   # exit 1 on regression
+
+A baseline comparison matches runs by map and engine.  Wall time slower
+than --tolerance allows (and by more than a couple of milliseconds), or
+any change in nodes expanded, path length or cost (which are
+deterministic), is reported as a regression.
+"""
+import argparse
+import json
+import random
+import sys
+import time
+import tracemalloc
+from itertools import accumulate
+
+import Pathfinder as pf
+
+KINDS     = ("random", "open", "maze", "rooms")
+ROOM_SIZE = 8               # interior cells per room side, rooms kind
+BUDGET    = 500_000         # expansions before a run is cut short (IDDFS on mazes)
+
+
+# ──────────────────────────────────────────
+#  MAP GENERATORS
+#  Each returns (cells, rows, cols, start, target) like pf.random_map.
+# ──────────────────────────────────────────
+
+def open_map(rows, cols, seed=None):
+    return bytearray(rows * cols), rows, cols, (0, 0), (rows - 1, cols - 1)
+
+
+def maze_map(rows, cols, seed=None):
+    """A perfect maze: passages on even cells, walls carved between them."""
+    rng   = random.Random(seed)
+    cells = bytearray(b"\x01") * (rows * cols)
+    cells[0] = 0
+    stack = [(0, 0)]
+    while stack:
+        r, c  = stack[-1]
+        steps = [(dr, dc) for dr, dc in ((-2, 0), (2, 0), (0, -2), (0, 2))
+                 if 0 <= r + dr < rows and 0 <= c + dc < cols
+                 and cells[(r + dr) * cols + c + dc]]
+        if not steps:
+            stack.pop()
+            continue
+        dr, dc = rng.choice(steps)
+        cells[(r + dr // 2) * cols + c + dc // 2] = 0
+        cells[(r + dr) * cols + c + dc] = 0
+        stack.append((r + dr, c + dc))
+    last_row, last_col = (rows - 1) & ~1, (cols - 1) & ~1
+    return cells, rows, cols, (0, 0), (last_row, last_col)
+
+
+def rooms_map(rows, cols, seed=None):
+    """Square rooms walled off from each other, one door per shared wall."""
+    rng   = random.Random(seed)
+    step  = ROOM_SIZE + 1
+    cells = bytearray(rows * cols)
+    for r in range(ROOM_SIZE, rows, step):
+        cells[r * cols:(r + 1) * cols] = b"\x01" * cols
+    for c in range(ROOM_SIZE, cols, step):
+        cells[c::cols] = b"\x01" * rows
+    for r0 in range(0, rows, step):
+        height = min(ROOM_SIZE, rows - r0)
+        for c0 in range(0, cols, step):
+            width = min(ROOM_SIZE, cols - c0)
+            if c0 + width < cols:           # door in the wall on the right
+                cells[(r0 + rng.randrange(height)) * cols + c0 + width] = 0
+            if r0 + height < rows:          # door in the wall below
+                cells[(r0 + height) * cols + c0 + rng.randrange(width)] = 0
+    target = (rows - 1, cols - 1)
+    if cells[-1]:                           # the last row/column is a wall line
+        target = (rows - 1 - (rows % step == 0), cols - 1 - (cols % step == 0))
+    return cells, rows, cols, (0, 0), target
+
+
+def make_map(kind, size, density, seed):
+    if kind == "random":
+        return pf.random_map(size, size, density, seed)
+    return {"open": open_map, "maze": maze_map, "rooms": rooms_map}[kind](size, size, seed)
+
+
+# ──────────────────────────────────────────
+#  MEASUREMENT
+# ──────────────────────────────────────────
+
+def _options(algo, rows, cols, weight):
+    if algo == "DLS":
+        return {"limit": rows * cols}       # deep enough to always reach the target
+    if algo == "A*":
+        return {"weight": weight}
+    return {}
+
+
+def _solve(events, budget):
+    """Run `events` to the end, giving up after `budget` expansions
+    (path None, over True)."""
+    expanded = 0
+    for kind, node, value in events:
+        if kind & ~pf.EV_BWD == pf.EV_EXPAND:
+            expanded += 1
+            if expanded > budget:
+                return {"path": None, "cost": None, "expanded": expanded, "over": True}
+        elif kind == pf.EV_FOUND:
+            return {"path": node, "cost": value, "expanded": expanded, "over": False}
+    return {"path": None, "cost": None, "expanded": expanded, "over": False}
+
+
+def _timed(algo, options, repeat, budget):
+    """Best wall time over `repeat` plain runs, and the last result."""
+    best = pf.INF
+    for _ in range(repeat):
+        began  = time.perf_counter()
+        result = _solve(pf.search(algo, **options), budget)
+        best   = min(best, time.perf_counter() - began)
+        if result["over"]:
+            break
+    return best, result
+
+
+def _instrumented(algo, options, budget, recorder=None):
+    """One counted run under tracemalloc: (SearchStats, peak heap bytes).
+
+    A `recorder` (tracefile.TraceRecorder) records the run on the way; the
+    recording only grows, so its final size is taken off the peak.
+    """
+    stats = pf.SearchStats()
+    tracemalloc.start()
+    try:
+        events = pf.instrument(pf.search(algo, **options), stats)
+        if recorder is not None:
+            events = pf._recorded(events, recorder)
+        for _ in events:
+            if stats.expansions > budget:
+                break
+        heap = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    if recorder is not None:
+        heap = max(0, heap - recorder.nbytes())
+    return stats, heap
+
+
+def _counted(algo, options, budget, recorder=None):
+    """One counted run that times itself: (seconds, result, SearchStats).
+
+    No tracemalloc.  A `recorder` records the run on the way and the
+    counts are then taken from the recording, after the clock has stopped.
+    """
+    stats  = pf.SearchStats()
+    events = pf.search(algo, **options)
+    if recorder is None:
+        events = pf.instrument(events, stats)
+    else:
+        events = pf._recorded(events, recorder)
+    began   = time.perf_counter()
+    result  = _solve(events, budget)
+    seconds = time.perf_counter() - began
+    if recorder is not None:
+        for kind, node in zip(recorder.kinds, accumulate(recorder.deltas)):
+            stats.observe(kind, node, None)
+    return seconds, result, stats
+
+
+def measure(algo, options, repeat=3, budget=BUDGET, recorder=None, heap=True):
+    """Time, count and weigh one engine on the live grid; a JSON-ready dict.
+
+    `options` go to Pathfinder.search and may include start and target.
+    A run that expands more than `budget` nodes is cut short and reported
+    with "over_budget" set; its figures cover only the work done so far.
+    Engines that never emit pushes (BFS-Bits, IDDFS) report no peak
+    frontier.  A tracefile.TraceRecorder passed as `recorder` records the
+    counted run, so no extra run is needed for a trace.
+
+    The peak heap comes from a separate run under tracemalloc, several
+    times slower than the search itself.  With heap=False that run is
+    skipped and peak_kib is None: a single counted run, timed, supplies
+    every figure (repeat still adds plain runs for the best time).
+    """
+    if heap:
+        seconds, result  = _timed(algo, options, repeat, budget)
+        stats, peak_heap = _instrumented(algo, options, budget, recorder)
+    else:
+        seconds, result, stats = _counted(algo, options, budget, recorder)
+        if repeat > 1 and not result["over"]:
+            seconds = min(seconds, _timed(algo, options, repeat - 1, budget)[0])
+        peak_heap = None
+    path = result["path"]
+    return {
+        "algo"          : algo,
+        "found"         : path is not None,
+        "over_budget"   : result["over"],
+        "length"        : len(path) if path else None,
+        "cost"          : round(result["cost"], 6) if path else None,
+        "expanded"      : result["expanded"],
+        "peak_frontier" : stats.max_frontier if stats.pushes else None,
+        "stale_pops"    : stats.stale_pops,
+        "re_expansions" : stats.re_expansions,
+        "peak_kib"      : round(peak_heap / 1024, 1) if heap else None,
+        "seconds"       : round(seconds, 6),
+    }
+
+
+def run_one(algo, map_info, repeat=3, weight=1.0, budget=BUDGET):
+    """Benchmark one engine on the live grid, tagged with `map_info`."""
+    options = _options(algo, pf.ROWS, pf.COLS, weight)
+    return {**map_info, **measure(algo, options, repeat, budget)}
+
+
+def run_suite(kinds, sizes, densities, algos, seed=0, repeat=3, weight=1.0,
+              budget=BUDGET, log=None):
+    """Benchmark `algos` on every generated map; a list of result dicts."""
+    results = []
+    for size in sizes:
+        for kind in kinds:
+            for density in (densities if kind == "random" else [None]):
+                pf.set_grid(*make_map(kind, size, density, seed))
+                began = time.perf_counter()
+                pf.neighbor_table()
+                pf.reachability()
+                map_info = {"kind": kind, "size": size, "density": density, "seed": seed,
+                            "index_seconds": round(time.perf_counter() - began, 6)}
+                for algo in algos:
+                    record = run_one(algo, map_info, repeat, weight, budget)
+                    results.append(record)
+                    if log:
+                        log(record)
+    return results
+
+
+# ──────────────────────────────────────────
+#  BASELINE COMPARISON
+# ──────────────────────────────────────────
+
+EXACT     = ("found", "over_budget", "expanded", "length", "cost")
+MIN_DELTA = 0.002           # seconds; smaller slowdowns are timer noise
+
+
+def _key(record):
+    return record["kind"], record["size"], record["density"], record["seed"], record["algo"]
+
+
+def compare(results, baseline, tolerance=0.25):
+    """Differences from a baseline run; returns (lines, regression count)."""
+    before = {_key(record): record for record in baseline}
+    lines, regressions = [], 0
+    for record in results:
+        old = before.get(_key(record))
+        if old is None:
+            lines.append(f"  new   {_label(record)}")
+            continue
+        ratio = record["seconds"] / old["seconds"] if old["seconds"] else 1.0
+        changed = [f"{field} {old.get(field)} → {record[field]}"
+                   for field in EXACT if old.get(field) != record[field]]
+        slower = (ratio > 1 + tolerance
+                  and record["seconds"] - old["seconds"] > MIN_DELTA)
+        if slower or changed:
+            regressions += 1
+            mark = "FAIL "
+        else:
+            mark = "  ok "
+        lines.append(f"{mark} {_label(record)}  time ×{ratio:.2f}"
+                     + "".join(f", {change}" for change in changed))
+    return lines, regressions
+
+
+# ──────────────────────────────────────────
+#  COMMAND LINE
+# ──────────────────────────────────────────
+
+def _label(record):
+    density = f"@{record['density']}" if record["density"] is not None else ""
+    return f"{record['kind']}{density} {record['size']}² {record['algo']}"
+
+
+def _print_row(record):
+    frontier = record["peak_frontier"]
+    outcome  = "over budget" if record["over_budget"] else f"cost {record['cost']}"
+    print(f"{_label(record):<32} {record['seconds'] * 1000:10.2f} ms"
+          f" {record['expanded']:>9} exp"
+          f" {'-' if frontier is None else frontier:>8} open"
+          f" {record['peak_kib']:>10.1f} KiB"
+          f"  {outcome}", flush=True)
+
+
+def _list_arg(convert, choices=None):
+    def parse(text):
+        try:
+            items = [convert(part) for part in text.split(",")]
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"bad list {text!r}")
+        for item in items:
+            if choices is not None and item not in choices:
+                raise argparse.ArgumentTypeError(
+                    f"unknown {item!r} (choose from {', '.join(choices)})")
+        return items
+    return parse
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Benchmark the search engines on seeded generated maps.")
+    parser.add_argument("--kinds", type=_list_arg(str, KINDS), default=list(KINDS),
+                        metavar="KIND[,KIND…]", help=f"map kinds: {', '.join(KINDS)}")
+    parser.add_argument("--sizes", type=_list_arg(int), default=[32, 64, 128],
+                        metavar="N[,N…]", help="square map sizes")
+    parser.add_argument("--densities", type=_list_arg(float), default=[0.1, 0.3],
+                        metavar="D[,D…]", help="wall densities for random maps")
+    parser.add_argument("--algos", type=pf._algos_arg, default=list(pf.SEARCHES),
+                        metavar="ALGO[,ALGO…]", help="engines to run (default: all)")
+    parser.add_argument("--seed", type=int, default=0, help="map generator seed")
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="timed runs per engine; the best is kept")
+    parser.add_argument("--weight", type=float, default=1.0, help="heuristic weight for A*")
+    parser.add_argument("--budget", type=int, default=BUDGET,
+                        help="expansions before a run is cut short")
+    parser.add_argument("--save", metavar="FILE", help="write the results as JSON")
+    parser.add_argument("--baseline", metavar="FILE",
+                        help="compare against a saved run; exit 1 on regressions")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="allowed slowdown against the baseline (0.25 = 25%%)")
+    parser.add_argument("--json", action="store_true",
+                        help="print the results as JSON instead of a table")
+    args = parser.parse_args(argv)
+    if args.repeat < 1:
+        parser.error(f"--repeat must be at least 1, got {args.repeat}")
+
+    results = run_suite(args.kinds, args.sizes, args.densities, args.algos,
+                        args.seed, args.repeat, args.weight, args.budget,
+                        log=None if args.json else _print_row)
+    if args.json:
+        json.dump(results, sys.stdout, indent=1)
+        sys.stdout.write("\n")
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as fh:
+            json.dump(results, fh, indent=1)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as fh:
+            baseline = json.load(fh)
+        lines, regressions = compare(results, baseline, args.tolerance)
+        print("\n".join(lines), file=sys.stderr)
+        print(f"{regressions} regression(s) against {args.baseline}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,114 @@
+"""Run several search engines side by side, each in its own process.
+
+Every engine solves the same query on the live grid at the same time, in
+a process pool that maps the grid through shared memory (see batch.py),
+so the whole comparison takes about as long as the slowest engine rather
+than the sum of all of them.  Each worker reports the engine's figures
+(benchmark.measure) and records its event stream as a trace, which the
+GUI's compare view animates in a tile per engine.
+
+    import Pathfinder, compare
+    Pathfinder.load_map("maps/example.txt")
+    for algo, record, recorder in compare.run_parallel(["BFS", "UCS", "A*"]):
+        print(algo, record["seconds"], record["expanded"])
+
+    python compare.py --random 300x300 --seed 1 --algo BFS,UCS,A*,Bidir
+"""
+import argparse
+import json
+import sys
+import time
+
+import Pathfinder as pf
+import batch
+import benchmark
+import tracefile
+
+
+def _run_engine(algo, options, start, target, record, heap):
+    """Worker task: measure one engine, recording its counted run if asked."""
+    query    = {"start": start, "target": target}
+    recorder = tracefile.TraceRecorder(algo, options, start, target) if record else None
+    summary  = benchmark.measure(algo, {**options, **query}, repeat=1,
+                                 recorder=recorder, heap=heap)
+    return algo, summary, recorder
+
+
+def run_parallel(algos, options=None, start=None, target=None, workers=None, record=True,
+                 heap=False):
+    """Run every engine in `algos` at once on the live grid.
+
+    `options` maps an engine name to its extra search options (limit for
+    DLS, weight for A*).  Yields (algo, summary, recorder) as engines
+    finish, fastest first: summary is a benchmark.measure dict and
+    recorder a tracefile.TraceRecorder of the run (None unless `record`).
+    `workers` defaults to one process per engine; workers=0 runs them one
+    after another in this process.
+
+    Each engine runs once, timing and recording itself.  heap=True adds a
+    tracemalloc run per engine for peak_kib, which takes several times
+    longer than the search; without it peak_kib is None.
+    """
+    options = options or {}
+    start   = tuple(pf.START if start is None else start)
+    target  = tuple(pf.TARGET if target is None else target)
+    tasks   = [(algo, options.get(algo, {}), start, target, record, heap) for algo in algos]
+    if workers == 0:
+        for task in tasks:
+            yield _run_engine(*task)
+        return
+    with batch.shared_pool(workers or len(tasks)) as pool:
+        pending = [pool.apply_async(_run_engine, task) for task in tasks]
+        while pending:
+            for job in [job for job in pending if job.ready()]:
+                pending.remove(job)
+                yield job.get()
+            if pending:
+                pending[0].wait(0.01)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Run several engines on one query in parallel and compare them.")
+    parser.add_argument("--algo", type=pf._algos_arg, default=list(pf.SEARCHES),
+                        metavar="ALGO[,ALGO…]", help="engines to compare (default: all)")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--map", help="text or binary map file (default: built-in 10x10)")
+    source.add_argument("--random", type=pf._size_arg, metavar="ROWSxCOLS",
+                        help="random map of this size instead of a file")
+    parser.add_argument("--density", type=float, default=0.25,
+                        help="wall density for --random")
+    parser.add_argument("--seed", type=int, help="random seed for --random")
+    parser.add_argument("--start", type=pf._cell_arg, help="ROW,COL")
+    parser.add_argument("--target", type=pf._cell_arg, help="ROW,COL")
+    parser.add_argument("--limit", type=int, default=15, help="depth limit for DLS")
+    parser.add_argument("--weight", type=float, default=1.0, help="heuristic weight for A*")
+    parser.add_argument("--workers", type=int,
+                        help="processes (default: one per engine; 0 runs them in turn)")
+    parser.add_argument("--heap", action="store_true",
+                        help="also measure each engine's peak heap (a slower second run)")
+    args = parser.parse_args(argv)
+
+    if args.map:
+        pf.load_map(args.map)
+    elif args.random:
+        pf.set_grid(*pf.random_map(*args.random, args.density, args.seed))
+    for option, cell in (("--start", args.start), ("--target", args.target)):
+        if cell is not None:
+            pf._check_cell(parser, option, cell)
+
+    options = {"DLS": {"limit": args.limit}, "A*": {"weight": args.weight}}
+    began   = time.perf_counter()
+    runs    = [summary for _, summary, _ in run_parallel(
+        args.algo, options, args.start, args.target, args.workers, record=False,
+        heap=args.heap)]
+    wall    = time.perf_counter() - began
+    json.dump({"rows": pf.ROWS, "cols": pf.COLS, "wall_seconds": round(wall, 6),
+               "runs": sorted(runs, key=lambda run: args.algo.index(run["algo"]))},
+              sys.stdout, indent=1)
+    sys.stdout.write("\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,1367 @@
+"""Tk front end for Pathfinder: animates the search event streams.
+
+Start it with ``python Pathfinder.py`` (see ``--help`` for the headless
+mode).  Nothing in Pathfinder itself imports Tk.
+"""
+import contextlib
+import json
+import os
+import queue
+import threading
+import time
+import tkinter as tk
+from itertools import compress
+from tkinter import filedialog
+
+import Pathfinder as pf
+import compare
+import tracefile
+
+# ──────────────────────────────────────────
+#  CONFIGURATION
+# ──────────────────────────────────────────
+VIEW_WIDTH       = 540    # viewport in pixels; the canvas never grows
+VIEW_HEIGHT      = 540
+CELL_SIZE        = 54     # largest zoom, in pixels per cell
+ZOOM_LEVELS      = (1, 2, 3, 4, 6, 9, 12, 18, 27, 36, CELL_SIZE)
+GRID_LINE_ZOOM   = 6      # cells this large get a one-pixel border
+LABEL_ZOOM       = 27     # ... and this large show their S / T labels
+BLOCK_ZOOM       = 9      # full repaints fill cell by cell from this zoom up
+REDRAW_CELLS     = 4000   # more changed cells than this: repaint the window
+DEFAULT_SPEED    = 6      # animation steps (expansions) per second
+MAX_SPEED        = 500
+FRAME_MS         = 33     # event queue is drained ~30 times a second
+FRAME_BUDGET     = 0.020  # seconds of event handling per frame at max speed
+EVENT_QUEUE_SIZE = 4096   # worker blocks once this many events are pending
+TILE_SIZE        = 240    # compare view: pixels per engine tile
+TILE_COLUMNS     = 4
+
+# ──────────────────────────────────────────
+#  COLORS
+# ──────────────────────────────────────────
+COLOR = {
+    "empty"        : "#F5F5F5",
+    "wall"         : "#2C2C2C",
+    "start"        : "#27AE60",
+    "target"       : "#E74C3C",
+    "frontier"     : "#AED6F1",
+    "explored"     : "#2980B9",
+    "path"         : "#8E44AD",
+    # Bidirectional-specific
+    "fwd_frontier" : "#AED6F1",
+    "bwd_frontier" : "#FADBD8",
+    "fwd_explored" : "#2980B9",
+    "bwd_explored" : "#C0392B",
+    "meet"         : "#F39C12",
+    "grid_line"    : "#BBBBBB",
+}
+
+
+# ──────────────────────────────────────────
+#  DRAWING – raster renderer
+#  The visible window of the map is painted into a single PhotoImage, so
+#  the canvas holds the same few items whatever the map size.  Each cell
+#  keeps a small bit set of search marks and its colour is looked up from
+#  the active scheme (standard or bidirectional).  Changed cells are filled
+#  into the image one by one; scrolling, zooming or a frame with very many
+#  changes repaints the whole window instead.
+# ──────────────────────────────────────────
+
+MARK_FRONTIER     = 1    # forward side (the only side in the standard scheme)
+MARK_EXPLORED     = 2
+MARK_BWD_FRONTIER = 4
+MARK_BWD_EXPLORED = 8
+MARK_PATH         = 16
+MARK_MEET         = 32
+
+# Static cell codes, OR-ed above the mark bits to index the palette
+STATIC_WALL   = 64
+STATIC_START  = 128
+STATIC_TARGET = 192
+
+_WALL_CODES = bytes.maketrans(b"\x00\x01", bytes([0, STATIC_WALL]))
+
+
+def _standard_color(marks):
+    if marks & MARK_PATH:
+        return COLOR["path"]
+    if marks & MARK_EXPLORED:
+        return COLOR["explored"]
+    if marks & MARK_FRONTIER:
+        return COLOR["frontier"]
+    return COLOR["empty"]
+
+
+def _bidir_color(marks):
+    if marks & MARK_PATH:
+        return COLOR["path"]
+    if marks & MARK_MEET:
+        return COLOR["meet"]
+    if marks & MARK_EXPLORED and marks & MARK_BWD_EXPLORED:
+        return COLOR["meet"]
+    if marks & MARK_EXPLORED:
+        return COLOR["fwd_explored"]
+    if marks & MARK_BWD_EXPLORED:
+        return COLOR["bwd_explored"]
+    if marks & MARK_FRONTIER:
+        return COLOR["fwd_frontier"]
+    if marks & MARK_BWD_FRONTIER:
+        return COLOR["bwd_frontier"]
+    return COLOR["empty"]
+
+
+STANDARD_SCHEME = [_standard_color(m) for m in range(64)]
+BIDIR_SCHEME    = [_bidir_color(m) for m in range(64)]
+
+
+def _palette(scheme):
+    """Colour for every mark | static code."""
+    return (scheme + [COLOR["wall"]] * 64
+            + [COLOR["start"]] * 64 + [COLOR["target"]] * 64)
+
+
+class GridRenderer:
+    """A scrollable, zoomable raster view of the live grid."""
+
+    def __init__(self, canvas, status_label, width=VIEW_WIDTH, height=VIEW_HEIGHT):
+        self.canvas       = canvas
+        self.status_label = status_label
+        self.width        = width
+        self.height       = height
+        self.image        = tk.PhotoImage(master=canvas, width=width, height=height)
+        canvas.create_image(0, 0, anchor=tk.NW, image=self.image)
+        self.start_item   = canvas.create_text(0, 0, text="S", fill="white",
+                                               font=("Arial", 14, "bold"),
+                                               state=tk.HIDDEN)
+        self.target_item  = canvas.create_text(0, 0, text="T", fill="white",
+                                               font=("Arial", 14, "bold"),
+                                               state=tk.HIDDEN)
+        self.on_view        = None  # on_view((x0, x1), (y0, y1)) after a scroll
+        self.scheme         = STANDARD_SCHEME
+        self.palette        = _palette(self.scheme)
+        self.pending_status = None
+        self.reset()
+
+    def reset(self):
+        """Start afresh on the live grid (its size may have changed)."""
+        size         = pf.ROWS * pf.COLS
+        self.marks   = bytearray(size)
+        self.touched = set()        # cells with non-zero marks
+        self.dirty   = set()        # cells to repaint at the next flush()
+        self.zoom    = self.fit_zoom()
+        self.top     = self.left = 0
+        self.refresh()
+
+    def refresh(self):
+        """Re-read walls, START and TARGET (after the live grid changed)."""
+        self.static = bytearray(pf.grid).translate(_WALL_CODES)
+        self.static[pf.node_id(*pf.START)]  = STATIC_START
+        self.static[pf.node_id(*pf.TARGET)] = STATIC_TARGET
+        self.redraw = True
+
+    def wall_changed(self, u, wall):
+        """Repaint cell u as a wall or an open cell after an edit."""
+        if self.static[u] in (0, STATIC_WALL):
+            self.static[u] = STATIC_WALL if wall else 0
+            self.dirty.add(u)
+
+    def cell_at(self, x, y):
+        """(row, col) under viewport pixel (x, y), or None off the map."""
+        row = self.top + y // self.zoom
+        col = self.left + x // self.zoom
+        if 0 <= row < pf.ROWS and 0 <= col < pf.COLS:
+            return row, col
+        return None
+
+    # ── Search marks ──────────────────────────────────────────────────
+    def set_marks(self, u, marks):
+        if self.marks[u] != marks:
+            self.marks[u] = marks
+            if marks:
+                self.touched.add(u)
+            self.dirty.add(u)
+
+    def add_marks(self, u, add, remove=0):
+        self.set_marks(u, (self.marks[u] & ~remove) | add)
+
+    def clear(self, bidir=None):
+        """Drop every search mark; optionally switch colour scheme."""
+        if bidir is not None:
+            scheme = BIDIR_SCHEME if bidir else STANDARD_SCHEME
+            if scheme is not self.scheme:
+                self.scheme, self.palette = scheme, _palette(scheme)
+                self.redraw = True
+        for u in self.touched:
+            self.marks[u] = 0
+        self.dirty |= self.touched
+        self.touched.clear()
+
+    def load_marks(self, marks):
+        """Replace every search mark at once (seeking a replay)."""
+        self.marks   = bytearray(marks)
+        self.touched = set(compress(range(len(marks)), marks))
+        self.dirty.clear()
+        self.redraw  = True
+
+    def apply(self, kind, node):
+        """Fold one push / expand / discard event into the cell marks."""
+        if kind & pf.EV_BWD:
+            frontier, explored = MARK_BWD_FRONTIER, MARK_BWD_EXPLORED
+        else:
+            frontier, explored = MARK_FRONTIER, MARK_EXPLORED
+        kind &= ~pf.EV_BWD
+        if kind == pf.EV_PUSH:
+            self.add_marks(node, frontier)
+        elif kind == pf.EV_EXPAND:
+            self.add_marks(node, explored, remove=frontier)
+        elif kind == pf.EV_DISCARD:
+            self.add_marks(node, 0, remove=frontier)
+
+    def show_path(self, path, meet=None):
+        for row, col in path:
+            self.add_marks(row * pf.COLS + col, MARK_PATH)
+        if meet is not None:
+            self.add_marks(pf.node_id(*meet), MARK_MEET)
+
+    def status(self, text):
+        self.pending_status = text
+
+    # ── Viewport ──────────────────────────────────────────────────────
+    def fit_zoom(self):
+        """Largest zoom level that shows the whole map, if any does."""
+        fit = min(self.width // pf.COLS, self.height // pf.ROWS)
+        return max((z for z in ZOOM_LEVELS if z <= fit), default=ZOOM_LEVELS[0])
+
+    def span(self):
+        """(rows, cols) of whole cells inside the viewport."""
+        return (min(pf.ROWS - self.top, self.height // self.zoom),
+                min(pf.COLS - self.left, self.width // self.zoom))
+
+    def scroll_to(self, top, left):
+        top  = max(0, min(int(top),  pf.ROWS - self.height // self.zoom))
+        left = max(0, min(int(left), pf.COLS - self.width // self.zoom))
+        if (top, left) != (self.top, self.left):
+            self.top, self.left = top, left
+            self.redraw = True
+
+    def set_zoom(self, zoom, x=None, y=None):
+        """Change pixels per cell, keeping the cell under (x, y) in place
+        (default: the centre of the view)."""
+        x = self.width // 2 if x is None else x
+        y = self.height // 2 if y is None else y
+        row = self.top + y / self.zoom
+        col = self.left + x / self.zoom
+        if zoom != self.zoom:
+            self.zoom, self.redraw = zoom, True
+        self.scroll_to(row - y / zoom, col - x / zoom)
+
+    def zoom_by(self, steps, x=None, y=None):
+        level = ZOOM_LEVELS.index(self.zoom) + steps
+        self.set_zoom(ZOOM_LEVELS[max(0, min(level, len(ZOOM_LEVELS) - 1))], x, y)
+
+    def xview(self, *args):
+        """Scrollbar command for the horizontal axis."""
+        self.scroll_to(self.top, self._scrolled(args, self.left, pf.COLS,
+                                                self.width // self.zoom))
+        self.flush()
+
+    def yview(self, *args):
+        """Scrollbar command for the vertical axis."""
+        self.scroll_to(self._scrolled(args, self.top, pf.ROWS,
+                                      self.height // self.zoom), self.left)
+        self.flush()
+
+    @staticmethod
+    def _scrolled(args, first, total, page):
+        if args[0] == "moveto":
+            return float(args[1]) * total
+        step = page if args[2] == "pages" else max(1, page // 10)
+        return first + int(args[1]) * step
+
+    # ── Painting ──────────────────────────────────────────────────────
+    def _inner(self):
+        """Pixels of colour per cell side; the rest is grid line."""
+        return self.zoom - 1 if self.zoom >= GRID_LINE_ZOOM else self.zoom
+
+    def _fill(self, u, row, col, inner):
+        x = (col - self.left) * self.zoom
+        y = (row - self.top) * self.zoom
+        self.image.put(self.palette[self.marks[u] | self.static[u]],
+                       to=(x, y, x + inner, y + inner))
+
+    def flush(self):
+        """Paint everything that changed since the last flush.
+
+        Marks and status are only recorded as events arrive; a cell that
+        is pushed and expanded within one frame is painted once, and cells
+        outside the viewport are not painted at all.
+        """
+        if not self.redraw and self.dirty:
+            top, left    = self.top, self.left
+            rows, cols   = self.span()
+            width        = pf.COLS
+            visible      = []
+            for u in self.dirty:
+                row, col = divmod(u, width)
+                if 0 <= row - top < rows and 0 <= col - left < cols:
+                    visible.append((u, row, col))
+            if len(visible) > REDRAW_CELLS:
+                self.redraw = True
+            else:
+                inner = self._inner()
+                for u, row, col in visible:
+                    self._fill(u, row, col, inner)
+        self.dirty.clear()
+        if self.redraw:
+            self._draw_view()
+        if self.pending_status is not None:
+            self.status_label.config(text=self.pending_status)
+            self.pending_status = None
+
+    def _draw_view(self):
+        """Repaint the whole viewport."""
+        self.redraw = False
+        rows, cols  = self.span()
+        inner       = self._inner()
+        self.image.blank()
+        if self.zoom >= BLOCK_ZOOM:
+            # Few, large cells: let Tk fill each one.
+            for row in range(self.top, self.top + rows):
+                u = row * pf.COLS + self.left
+                for col in range(self.left, self.left + cols):
+                    self._fill(u, row, col, inner)
+                    u += 1
+        else:
+            # Many small cells: one pixel block, built a cell row at a time.
+            self.image.put(" ".join(self._pixel_rows(rows, cols, inner)), to=(0, 0))
+        for item, cell in ((self.start_item, pf.START), (self.target_item, pf.TARGET)):
+            self._place_label(item, cell)
+        if self.on_view is not None:
+            self.on_view((self.left / pf.COLS, (self.left + cols) / pf.COLS),
+                         (self.top / pf.ROWS, (self.top + rows) / pf.ROWS))
+
+    def _pixel_rows(self, rows, cols, inner):
+        line   = " " + COLOR["grid_line"] if inner < self.zoom else ""
+        cell   = [" ".join([color] * inner) + line for color in self.palette]
+        border = "{" + " ".join([COLOR["grid_line"]] * (cols * self.zoom)) + "}"
+        marks, static = self.marks, self.static
+        for row in range(self.top, self.top + rows):
+            a     = row * pf.COLS + self.left
+            codes = (int.from_bytes(marks[a:a + cols], "big")
+                     | int.from_bytes(static[a:a + cols], "big")).to_bytes(cols, "big")
+            pixels = "{" + " ".join([cell[code] for code in codes]) + "}"
+            for _ in range(inner):
+                yield pixels
+            if line:
+                yield border
+
+    def _place_label(self, item, cell):
+        row, col   = cell
+        rows, cols = self.span()
+        if (self.zoom < LABEL_ZOOM or not 0 <= row - self.top < rows
+                or not 0 <= col - self.left < cols):
+            self.canvas.itemconfig(item, state=tk.HIDDEN)
+            return
+        half = self._inner() // 2
+        self.canvas.coords(item, (col - self.left) * self.zoom + half,
+                           (row - self.top) * self.zoom + half)
+        self.canvas.itemconfig(item, state=tk.NORMAL)
+
+
+# ──────────────────────────────────────────
+#  ANIMATION  (subscribes to the event stream)
+# ──────────────────────────────────────────
+
+def status_text(algo, kind, node, value):
+    """Status-bar line for one expansion event."""
+    if algo in pf.BIDIRECTIONAL:
+        side = "BWD" if kind & pf.EV_BWD else "FWD"
+        if algo == "Bidir-UCS":
+            return f"{algo} – {side} exploring {node}  cost={value:.2f}"
+        return f"{algo} – {side} exploring {node}"
+    if algo.startswith("UCS") or algo in ("A*", "LPA*"):
+        return f"{algo} – exploring {node}  cost={value:.2f}"
+    if algo in ("DLS", "IDDFS"):
+        return f"{algo} – exploring {node}  depth={value}"
+    return f"{algo} – exploring {node}"
+
+
+class SearchAnimation:
+    """Folds one search's event stream into a GridRenderer.
+
+    feed() returns how many animation steps the event is worth (one per
+    expansion, a little more for an IDDFS restart, nothing for pushes), so
+    the caller can pace playback in steps per second.
+    """
+
+    def __init__(self, renderer, algo, options):
+        self.renderer   = renderer
+        self.algo       = algo
+        self.options    = options
+        self.bidir      = algo in pf.BIDIRECTIONAL
+        self.last_limit = None
+        self.expanded   = 0
+        self.done       = False
+        self.path       = None
+        renderer.clear(bidir=self.bidir)
+
+    def feed(self, kind, node, value):
+        renderer = self.renderer
+        base     = kind & ~pf.EV_BWD
+
+        if base <= pf.EV_DISCARD:
+            renderer.apply(kind, node)
+            if base == pf.EV_EXPAND:
+                self.expanded += 1
+                renderer.status(status_text(self.algo, kind, pf.cell_of(node), value))
+                return 1
+            return 0
+
+        if kind == pf.EV_LIMIT:
+            steps = 1
+            if self.last_limit is not None:
+                steps += 1.5
+            self.last_limit = value
+            renderer.clear()
+            renderer.status(f"IDDFS – starting iteration  depth limit = {value}")
+            return steps
+
+        if kind == pf.EV_FOUND:
+            meet = None
+            if self.bidir:
+                both = MARK_EXPLORED | MARK_BWD_EXPLORED
+                meet = next((c for c in node
+                             if renderer.marks[pf.node_id(*c)] & both == both), None)
+            renderer.show_path(node, meet)
+            renderer.status(f"{self.algo} – Path Found! ✓  length={len(node)}  "
+                            f"cost={value:.2f}  expanded={self.expanded}")
+            self.path = node
+        elif self.algo == "DLS":
+            renderer.status(f"DLS – No path within depth limit {self.options.get('limit')} ✗")
+        else:
+            renderer.status(f"{self.algo} – No path found ✗")
+        self.done = True
+        return 0
+
+
+# ──────────────────────────────────────────
+#  BACKGROUND SEARCH
+#  The search runs on a worker thread and hands its events to the Tk
+#  thread through a bounded queue; the window drains that queue from
+#  root.after() at a fixed frame rate, so it never blocks on the search.
+# ──────────────────────────────────────────
+
+DONE = None             # queue sentinel: the worker has finished
+IDLE = object()         # _take(): nothing queued yet
+
+
+class SearchWorker(threading.Thread):
+    """Runs one search off the Tk thread, feeding a bounded event queue.
+
+    The events are counted into `stats` and recorded into `recorder` (a
+    tracefile.TraceRecorder) on the way; with a `profile` path the search
+    runs under cProfile (see Pathfinder.profiling).  A ready-made event
+    stream such as an LPA* replan can be passed as `source` instead; it
+    is not recorded, since it only repairs an earlier search.
+    """
+
+    def __init__(self, algo, options, stats, profile=None, maxsize=EVENT_QUEUE_SIZE,
+                 source=None):
+        super().__init__(daemon=True)
+        self.algo      = algo
+        self.options   = options
+        self.stats     = stats
+        self.profile   = profile
+        self.source    = source
+        self.recorder  = tracefile.TraceRecorder(algo, options) if source is None else None
+        self.events    = queue.Queue(maxsize)
+        self.cancelled = threading.Event()
+        self.error     = None
+
+    def run(self):
+        profiled = pf.profiling(self.profile) if self.profile else contextlib.nullcontext()
+        recorder = self.recorder
+        try:
+            with profiled:
+                events = self.source or pf.search(self.algo, **self.options)
+                for event in pf.instrument(events, self.stats):
+                    if recorder is not None:
+                        recorder.add(*event)
+                    if not self._put(event):
+                        return
+        except Exception as exc:        # reported by the Tk side
+            self.error = exc
+        self._put(DONE)
+
+    def _put(self, item):
+        # Block while the queue is full, but give up promptly on cancel.
+        while not self.cancelled.is_set():
+            try:
+                self.events.put(item, timeout=0.05)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def next_event(self):
+        """The next queued event, IDLE if none is ready yet, or DONE."""
+        try:
+            return self.events.get_nowait()
+        except queue.Empty:
+            return IDLE
+
+    def cancel(self):
+        self.cancelled.set()
+
+
+def replan_events(planner, cell, wall):
+    """Apply one wall edit to an LPA* planner, then repair its plan."""
+    planner.set_wall(*cell, wall)
+    yield from planner.search()
+
+
+class TracePlayer:
+    """Replays a recorded trace through the same interface as SearchWorker."""
+
+    def __init__(self, trace, position, stats):
+        self.trace    = trace
+        self.position = position
+        self.stats    = stats
+        self.error    = None
+
+    def start(self):
+        pass
+
+    def next_event(self):
+        if self.position >= len(self.trace):
+            return DONE
+        event = self.trace.event(self.position)
+        self.position += 1
+        self.stats.observe(*event)
+        return event
+
+    def cancel(self):
+        pass
+
+
+# ──────────────────────────────────────────
+#  LEGEND
+# ──────────────────────────────────────────
+
+def build_legend(parent):
+    frame = tk.Frame(parent, bg="#FAFAFA", bd=1, relief=tk.GROOVE)
+    frame.pack(fill=tk.X, padx=10, pady=(0, 10))
+
+    items = [
+        (COLOR["start"],        "Start (S)"),
+        (COLOR["target"],       "Target (T)"),
+        (COLOR["wall"],         "Static Wall"),
+        (COLOR["fwd_frontier"], "Fwd Frontier"),
+        (COLOR["bwd_frontier"], "Bwd Frontier"),
+        (COLOR["fwd_explored"], "Fwd Explored"),
+        (COLOR["bwd_explored"], "Bwd Explored"),
+        (COLOR["meet"],         "Meeting Node"),
+        (COLOR["path"],         "Final Path"),
+    ]
+
+    for i, (color, label) in enumerate(items):
+        tk.Label(frame, bg=color, width=2,
+                 relief=tk.RAISED).grid(row=0, column=i*2,   padx=(6, 2), pady=5)
+        tk.Label(frame, text=label, bg="#FAFAFA",
+                 font=("Arial", 8)).grid(row=0, column=i*2+1, padx=(0, 8))
+
+
+# ──────────────────────────────────────────
+#  COMPARE VIEW
+#  The selected engines run at once in a process pool (compare.py).  As
+#  each worker reports back, its row of the summary table fills in and its
+#  tile starts animating the recorded event stream; all tiles play
+#  together, paced by the main window's speed controls.
+# ──────────────────────────────────────────
+
+TABLE_COLUMNS = (("Engine", "algo"), ("Time (ms)", "seconds"), ("Expanded", "expanded"),
+                 ("Max frontier", "peak_frontier"), ("Length", "length"), ("Cost", "cost"))
+
+
+def _cell_text(field, value):
+    if value is None:
+        return "–"
+    if field == "seconds":
+        return f"{value * 1000:.1f}"
+    if field == "cost":
+        return f"{value:.2f}"
+    return str(value)
+
+
+class CompareWindow:
+    """A window of engine tiles and a summary table for one comparison."""
+
+    def __init__(self, app):
+        self.app      = app
+        self.window   = tk.Toplevel(app.root)
+        self.window.title("AI Pathfinder – Compare")
+        self.window.configure(bg="#FAFAFA")
+        self.window.protocol("WM_DELETE_WINDOW", self.close)
+
+        picks = tk.Frame(self.window, bg="#FAFAFA")
+        picks.pack(padx=10, pady=8)
+        self.picked = {}
+        for i, algo in enumerate(pf.SEARCHES):
+            self.picked[algo] = tk.BooleanVar(self.window, value=True)
+            tk.Checkbutton(picks, text=algo, variable=self.picked[algo], bg="#FAFAFA",
+                           font=("Arial", 9)).grid(row=0, column=i, padx=2)
+        self.run_btn = tk.Button(picks, text="▶  Run All", command=self.run,
+                                 bg="#2980B9", fg="white", font=("Arial", 10, "bold"),
+                                 relief=tk.FLAT, padx=10)
+        self.run_btn.grid(row=0, column=len(pf.SEARCHES), padx=(10, 0))
+
+        self.body      = None
+        self.after_id  = None
+        self.collector = None
+        self.set_runnable(app.worker is None)
+
+    def busy(self):
+        """True from Run All until every tile has finished playing."""
+        return self.after_id is not None
+
+    def set_runnable(self, runnable):
+        """Enable Run All unless the main window is searching or replanning."""
+        if not self.busy():
+            self.run_btn.config(state=tk.NORMAL if runnable else tk.DISABLED)
+
+    def run(self):
+        """Start every picked engine on the live grid at once."""
+        algos = [algo for algo, var in self.picked.items() if var.get()]
+        if not algos or self.app.worker is not None:
+            return
+        options = {}
+        for algo in algos:
+            options[algo] = self.app.search_options(algo)
+            if options[algo] is None:
+                return              # the main window says what is wrong
+        self.run_btn.config(state=tk.DISABLED)
+        self._build(algos)
+        self.algos, self.options = algos, options
+        self.players    = {}        # algo -> [TracePlayer, SearchAnimation, steps banked]
+        self.summaries  = {}        # algo -> compare.run_parallel summary
+        self.results    = queue.Queue()
+        self.wall       = None
+        self.began      = self.last_frame = time.perf_counter()
+        self.collector  = threading.Thread(target=self._collect, daemon=True,
+                                           args=(algos, options, self.results))
+        self.collector.start()
+        self.after_id   = self.window.after(FRAME_MS, self._frame)
+        self.app.compare_changed()
+
+    def _build(self, algos):
+        if self.body is not None:
+            self.body.destroy()
+        self.body = tk.Frame(self.window, bg="#FAFAFA")
+        self.body.pack(padx=10, pady=(0, 10))
+
+        # Tiles share one pair of scrollbars, the mouse wheel zooms and a
+        # middle-drag pans: every tile follows, so they stay aligned.
+        view  = tk.Frame(self.body, bg="#FAFAFA")
+        view.pack()
+        tiles = tk.Frame(view, bg="#FAFAFA")
+        tiles.grid(row=0, column=0)
+        self.renderers = {}
+        for i, algo in enumerate(algos):
+            tile = tk.Frame(tiles, bg="#FAFAFA")
+            tile.grid(row=i // TILE_COLUMNS, column=i % TILE_COLUMNS, padx=4, pady=4)
+            tk.Label(tile, text=algo, bg="#FAFAFA",
+                     font=("Arial", 10, "bold")).pack()
+            canvas = tk.Canvas(tile, width=TILE_SIZE, height=TILE_SIZE, bg="#FAFAFA",
+                               bd=0, highlightthickness=0)
+            canvas.pack()
+            canvas.bind("<MouseWheel>",
+                        lambda e: self._views("zoom_by", 1 if e.delta > 0 else -1, e.x, e.y))
+            canvas.bind("<Button-4>", lambda e: self._views("zoom_by", 1, e.x, e.y))
+            canvas.bind("<Button-5>", lambda e: self._views("zoom_by", -1, e.x, e.y))
+            canvas.bind("<ButtonPress-2>", self._pan_start)
+            canvas.bind("<B2-Motion>", self._pan_move)
+            status = tk.Label(tile, text="", bg="#FAFAFA", fg="#333333",
+                              font=("Arial", 8, "italic"), wraplength=TILE_SIZE)
+            status.pack()
+            renderer = GridRenderer(canvas, status, TILE_SIZE, TILE_SIZE)
+            renderer.status("running…")
+            renderer.flush()
+            self.renderers[algo] = renderer
+
+        xbar = tk.Scrollbar(view, orient=tk.HORIZONTAL,
+                            command=lambda *args: self._views("xview", *args))
+        ybar = tk.Scrollbar(view, orient=tk.VERTICAL,
+                            command=lambda *args: self._views("yview", *args))
+        xbar.grid(row=1, column=0, sticky="ew")
+        ybar.grid(row=0, column=1, sticky="ns")
+        self.lead = self.renderers[algos[0]]
+        self.lead.on_view = lambda xs, ys: (xbar.set(*xs), ybar.set(*ys))
+        self.lead.redraw  = True
+        self.lead.flush()
+        self.pan_anchor   = None
+
+        table = tk.Frame(self.body, bg="#FAFAFA", bd=1, relief=tk.GROOVE)
+        table.pack(fill=tk.X, pady=(8, 0))
+        for col, (heading, _) in enumerate(TABLE_COLUMNS):
+            tk.Label(table, text=heading, bg="#FAFAFA",
+                     font=("Arial", 9, "bold")).grid(row=0, column=col, padx=8)
+        self.cells = {}
+        for row, algo in enumerate(algos, 1):
+            for col, (_, field) in enumerate(TABLE_COLUMNS):
+                label = tk.Label(table, text=algo if col == 0 else "…",
+                                 bg="#FAFAFA", font=("Arial", 9))
+                label.grid(row=row, column=col, padx=8)
+                self.cells[algo, field] = label
+        self.wall_label = tk.Label(self.body, text="", bg="#FAFAFA", fg="#333333",
+                                   font=("Arial", 10, "italic"))
+        self.wall_label.pack(pady=(6, 0))
+
+    def _views(self, method, *args):
+        """Scroll or zoom every tile the same way."""
+        for renderer in self.renderers.values():
+            getattr(renderer, method)(*args)
+            renderer.flush()
+
+    def _pan_start(self, event):
+        self.pan_anchor = (event.x, event.y, self.lead.top, self.lead.left)
+
+    def _pan_move(self, event):
+        x, y, top, left = self.pan_anchor
+        zoom = self.lead.zoom
+        self._views("scroll_to", top - (event.y - y) / zoom, left - (event.x - x) / zoom)
+
+    def _collect(self, algos, options, results):
+        """Collector thread: forward worker results to the Tk side, each
+        recording already turned into a Trace (keyframes and all) here
+        rather than on the Tk thread."""
+        try:
+            for algo, summary, recorder in compare.run_parallel(algos, options):
+                results.put((algo, summary, recorder.trace()))
+        except Exception as exc:        # reported by the Tk side
+            results.put(exc)
+        results.put(DONE)
+
+    def _receive(self):
+        while True:
+            try:
+                result = self.results.get_nowait()
+            except queue.Empty:
+                return
+            if result is DONE:
+                self.wall = time.perf_counter() - self.began
+                self._show_wall()
+            elif isinstance(result, Exception):
+                self.wall_label.config(text=f"Error: {result}")
+            else:
+                algo, summary, trace = result
+                self.summaries[algo] = summary
+                for _, field in TABLE_COLUMNS[1:]:
+                    self.cells[algo, field].config(text=_cell_text(field, summary[field]))
+                animation = SearchAnimation(self.renderers[algo], algo, self.options[algo])
+                player    = TracePlayer(trace, 0, pf.SearchStats())
+                self.players[algo] = [player, animation, 0.0]
+
+    def _show_wall(self):
+        times = [summary["seconds"] for summary in self.summaries.values()]
+        self.wall_label.config(
+            text=f"{len(times)} engines in {self.wall:.2f} s wall"
+                 f"  ·  slowest run {max(times, default=0):.2f} s"
+                 f"  ·  sum of runs {sum(times):.2f} s")
+
+    def _frame(self):
+        """One frame: take in finished workers, then advance every tile."""
+        self._receive()
+        now   = time.perf_counter()
+        speed = self.app.speed_var.get()
+        turbo = self.app.turbo_var.get()
+        live  = [entry for entry in self.players.values() if not entry[1].done]
+        for entry in live:
+            player, animation, banked = entry
+            # Each tile gets an equal slice of the frame, timed from when
+            # its own turn starts.
+            deadline = time.perf_counter() + FRAME_BUDGET / len(live)
+            banked  += (now - self.last_frame) * speed
+            while turbo or banked >= 1:
+                event = player.next_event()
+                if event is DONE:
+                    animation.done = True
+                    break
+                banked -= animation.feed(*event)
+                if animation.done or turbo and time.perf_counter() >= deadline:
+                    break
+            entry[2] = max(banked, 0.0)
+            animation.renderer.flush()
+        self.last_frame = now
+
+        if self.wall is not None and all(entry[1].done for entry in self.players.values()):
+            self.after_id = None
+            self.set_runnable(self.app.worker is None)
+            self.app.compare_changed()
+        else:
+            self.after_id = self.window.after(FRAME_MS, self._frame)
+
+    def close(self):
+        if self.after_id is not None:
+            self.window.after_cancel(self.after_id)
+            self.after_id = None
+        self.app.compare_window = None
+        self.app.compare_changed()
+        self.window.destroy()
+
+
+# ──────────────────────────────────────────
+#  MAIN WINDOW
+# ──────────────────────────────────────────
+
+class PathfinderApp:
+    """The main window: canvas, algorithm controls and legend."""
+
+    def __init__(self, root, algo="BFS", profile=None):
+        self.root    = root
+        self.profile = profile
+        root.title("AI Pathfinder – BFS / DFS / UCS / A* / DLS / IDDFS / Bidir")
+        root.resizable(False, False)
+        root.configure(bg="#FAFAFA")
+
+        # Title label inside window
+        tk.Label(root, text="AI Pathfinder – Uninformed & Informed Search",
+                 font=("Arial", 15, "bold"), bg="#FAFAFA").pack(pady=(10, 2))
+
+        tk.Label(root,
+                 text="Visualizing search step-by-step – click cells to add or remove walls",
+                 font=("Arial", 9, "italic"), fg="#888888", bg="#FAFAFA").pack(pady=(0, 6))
+
+        # Viewport: fixed-size canvas with scrollbars, status bar below
+        view = tk.Frame(root, bg="#FAFAFA")
+        view.pack(padx=10)
+        self.canvas = tk.Canvas(view, width=VIEW_WIDTH, height=VIEW_HEIGHT,
+                                bg="#FAFAFA", bd=0, highlightthickness=0)
+        self.canvas.grid(row=0, column=0)
+        self.status_label = tk.Label(view, text="", bg="#FAFAFA", fg="#333333",
+                                     font=("Arial", 10, "italic"))
+        self.stats_label  = tk.Label(view, text="", bg="#FAFAFA", fg="#888888",
+                                     font=("Arial", 9))
+        self.renderer = GridRenderer(self.canvas, self.status_label)
+
+        xbar = tk.Scrollbar(view, orient=tk.HORIZONTAL, command=self.renderer.xview)
+        ybar = tk.Scrollbar(view, orient=tk.VERTICAL, command=self.renderer.yview)
+        xbar.grid(row=1, column=0, sticky="ew")
+        ybar.grid(row=0, column=1, sticky="ns")
+        self.status_label.grid(row=2, column=0, columnspan=2, pady=(4, 0))
+        self.stats_label.grid(row=3, column=0, columnspan=2)
+        self.renderer.on_view = lambda xs, ys: (xbar.set(*xs), ybar.set(*ys))
+
+        # Mouse wheel zooms around the pointer; middle-drag pans
+        self.canvas.bind("<MouseWheel>",
+                         lambda e: self.zoom_view(1 if e.delta > 0 else -1, e.x, e.y))
+        self.canvas.bind("<Button-4>", lambda e: self.zoom_view(1, e.x, e.y))
+        self.canvas.bind("<Button-5>", lambda e: self.zoom_view(-1, e.x, e.y))
+        self.canvas.bind("<Button-1>", self.toggle_wall)
+        self.canvas.bind("<ButtonPress-2>", self._pan_start)
+        self.canvas.bind("<B2-Motion>", self._pan_move)
+        self.pan_anchor = None
+
+        # Controls row
+        ctrl = tk.Frame(root, bg="#FAFAFA")
+        ctrl.pack(pady=8)
+
+        tk.Label(ctrl, text="Algorithm:", bg="#FAFAFA",
+                 font=("Arial", 11)).grid(row=0, column=0, padx=6)
+
+        self.algo_var = tk.StringVar(root)
+        self.algo_var.set(algo)
+        tk.OptionMenu(ctrl, self.algo_var, *pf.SEARCHES).grid(row=0, column=1, padx=6)
+
+        # Depth limit row (DLS only)
+        depth_frame = tk.Frame(root, bg="#FAFAFA")
+        depth_frame.pack(pady=(0, 4))
+        tk.Label(depth_frame, text="Depth Limit (DLS):", bg="#FAFAFA",
+                 font=("Arial", 10)).grid(row=0, column=0, padx=6)
+        self.depth_var = tk.StringVar(root)
+        self.depth_var.set("15")
+        tk.Entry(depth_frame, textvariable=self.depth_var, width=5,
+                 font=("Arial", 11), justify="center").grid(row=0, column=1, padx=4)
+        tk.Label(depth_frame, text="Weight (A*):", bg="#FAFAFA",
+                 font=("Arial", 10)).grid(row=0, column=2, padx=(16, 6))
+        self.weight_var = tk.StringVar(root)
+        self.weight_var.set("1.0")
+        tk.Entry(depth_frame, textvariable=self.weight_var, width=5,
+                 font=("Arial", 11), justify="center").grid(row=0, column=3, padx=4)
+
+        self.run_btn = tk.Button(ctrl, text="▶  Run Search",
+                                 command=self.run_algorithm,
+                                 bg="#2980B9", fg="white",
+                                 font=("Arial", 11, "bold"),
+                                 relief=tk.FLAT, padx=12, pady=4)
+        self.run_btn.grid(row=0, column=2, padx=10)
+
+        self.stop_btn = tk.Button(ctrl, text="■  Stop",
+                                  command=self.stop_search, state=tk.DISABLED,
+                                  bg="#C0392B", fg="white",
+                                  font=("Arial", 11, "bold"),
+                                  relief=tk.FLAT, padx=12, pady=4)
+        self.stop_btn.grid(row=0, column=3, padx=(0, 10))
+
+        tk.Button(ctrl, text="⧉  Compare", command=self.open_compare,
+                  font=("Arial", 11), relief=tk.FLAT, padx=8,
+                  pady=4).grid(row=0, column=4)
+
+        # Speed row (replaces the old fixed per-step delay)
+        speed_frame = tk.Frame(root, bg="#FAFAFA")
+        speed_frame.pack(pady=(0, 4))
+        tk.Label(speed_frame, text="Speed (steps/s):", bg="#FAFAFA",
+                 font=("Arial", 10)).grid(row=0, column=0, padx=6)
+        self.speed_var = tk.IntVar(root, value=DEFAULT_SPEED)
+        tk.Scale(speed_frame, variable=self.speed_var, from_=1, to=MAX_SPEED,
+                 orient=tk.HORIZONTAL, length=220, showvalue=True,
+                 bg="#FAFAFA", highlightthickness=0).grid(row=0, column=1, padx=4)
+        self.turbo_var = tk.BooleanVar(root, value=False)
+        tk.Checkbutton(speed_frame, text="Max (skip frames)", variable=self.turbo_var,
+                       bg="#FAFAFA", font=("Arial", 9)).grid(row=0, column=2, padx=6)
+
+        # Legend
+        build_legend(root)
+
+        # View row: zoom and map loading
+        view_frame = tk.Frame(root, bg="#FAFAFA")
+        view_frame.pack(pady=(0, 4))
+        tk.Button(view_frame, text="−", width=2,
+                  command=lambda: self.zoom_view(-1)).grid(row=0, column=0, padx=2)
+        tk.Button(view_frame, text="+", width=2,
+                  command=lambda: self.zoom_view(1)).grid(row=0, column=1, padx=2)
+        tk.Button(view_frame, text="Fit", command=self.fit_view).grid(row=0, column=2, padx=2)
+        self.open_btn = tk.Button(view_frame, text="Open Map…", command=self.open_map)
+        self.open_btn.grid(row=0, column=3, padx=(12, 2))
+        self.reset_btn = tk.Button(view_frame, text="Reset Walls", command=self.reset_walls)
+        self.reset_btn.grid(row=0, column=4, padx=2)
+        self.stats_btn = tk.Button(view_frame, text="Save Stats…", command=self.save_stats,
+                                   state=tk.DISABLED)
+        self.stats_btn.grid(row=0, column=5, padx=(12, 2))
+
+        # Replay row: recorded traces, scrubbing and comparison
+        replay_frame = tk.Frame(root, bg="#FAFAFA")
+        replay_frame.pack(pady=(0, 8))
+        self.trace_btn = tk.Button(replay_frame, text="Open Trace…", command=self.open_trace)
+        self.trace_btn.grid(row=0, column=0, padx=2)
+        self.save_trace_btn = tk.Button(replay_frame, text="Save Trace…",
+                                        command=self.save_trace, state=tk.DISABLED)
+        self.save_trace_btn.grid(row=0, column=1, padx=2)
+        self.compare_btn = tk.Button(replay_frame, text="Compare…",
+                                     command=self.compare_trace, state=tk.DISABLED)
+        self.compare_btn.grid(row=0, column=2, padx=2)
+        self.play_btn = tk.Button(replay_frame, text="▶ Replay", command=self.play_trace,
+                                  state=tk.DISABLED)
+        self.play_btn.grid(row=0, column=3, padx=(12, 2))
+        self.scrub_var = tk.IntVar(root, value=0)
+        self.scrub = tk.Scale(replay_frame, variable=self.scrub_var, from_=0, to=0,
+                              orient=tk.HORIZONTAL, length=220, showvalue=False,
+                              command=self.seek, state=tk.DISABLED,
+                              bg="#FAFAFA", highlightthickness=0)
+        self.scrub.grid(row=0, column=4, padx=4)
+
+        # Initial draw
+        self.renderer.status("Select an algorithm and press ▶ Run Search"
+                             " – click a cell to toggle a wall")
+        self.renderer.flush()
+
+        self.planner   = None       # LPA* state kept across wall edits
+        self.replanning = False     # the worker is repairing that state
+        self.stats     = None       # SearchStats of the current / last run
+        self.run_info  = None       # (algo, options) of that run
+        self.recorded  = None       # TraceRecorder of the last live run
+        self.trace     = None       # tracefile.Trace being replayed
+        self.other     = None       # ... and the one it is compared with
+        self.worker    = None
+        self.animation = None
+        self.compare_window = None
+        self.after_id  = None
+
+    # ── View callbacks ────────────────────────────────────────────────
+    def zoom_view(self, steps, x=VIEW_WIDTH // 2, y=VIEW_HEIGHT // 2):
+        self.renderer.zoom_by(steps, x, y)
+        self.renderer.flush()
+
+    def fit_view(self):
+        self.renderer.set_zoom(self.renderer.fit_zoom())
+        self.renderer.scroll_to(0, 0)
+        self.renderer.flush()
+
+    def _pan_start(self, event):
+        self.pan_anchor = (event.x, event.y, self.renderer.top, self.renderer.left)
+
+    def _pan_move(self, event):
+        x, y, top, left = self.pan_anchor
+        zoom = self.renderer.zoom
+        self.renderer.scroll_to(top - (event.y - y) / zoom, left - (event.x - x) / zoom)
+        self.renderer.flush()
+
+    def open_map(self):
+        path = filedialog.askopenfilename(
+            title="Open map", filetypes=[("Text maps", "*.txt"), ("All files", "*")])
+        if not path:
+            return
+        try:
+            pf.load_map(path)
+        except (OSError, ValueError) as exc:
+            self.renderer.status(f"Could not open map: {exc}")
+        else:
+            self.renderer.reset()
+            self._drop_trace()
+            self.renderer.status(f"{os.path.basename(path)}  ({pf.ROWS}×{pf.COLS})"
+                                 " – press ▶ Run Search")
+        self.renderer.flush()
+
+    # ── Wall editing ──────────────────────────────────────────────────
+    def toggle_wall(self, event):
+        """Flip the clicked cell between wall and open, then replan."""
+        cell = self.renderer.cell_at(event.x, event.y)
+        if (self.worker is not None or self._comparing()
+                or cell is None or cell in (pf.START, pf.TARGET)):
+            return
+        if self.planner is None or (self.planner.start, self.planner.target) != (pf.START, pf.TARGET):
+            self.planner = pf.IncrementalPlanner()
+        wall = not pf.is_wall(*cell)
+        self.renderer.wall_changed(pf.node_id(*cell), wall)
+        self._drop_trace()
+        self.replan(cell, wall)
+
+    def replan(self, cell, wall):
+        """Make the edit and repair the LPA* plan on the worker thread,
+        drawing the cells it revisits at full speed."""
+        self.renderer.status("LPA* – replanning…")
+        self._start_stats("LPA*", {})
+        self.animation  = SearchAnimation(self.renderer, "LPA*", {})
+        self.replanning = True
+        self.renderer.flush()
+        self._start(SearchWorker("LPA*", {}, self.stats,
+                                 source=replan_events(self.planner, cell, wall)))
+
+    def _replan_status(self):
+        updated = self.animation.expanded
+        path    = self.animation.path
+        if path is None:
+            return f"LPA* – replanned, {updated} cells updated  – no path ✗"
+        return (f"LPA* – replanned, {updated} cells updated  "
+                f"length={len(path)}  cost={pf.path_cost(path):.2f}")
+
+    def reset_walls(self):
+        """Drop every wall edit: back to the map as loaded."""
+        pf.reset_grid()
+        self.renderer.refresh()
+        self.renderer.clear()
+        self.renderer.status("Walls reset to the loaded map")
+        self.renderer.flush()
+
+    # ── Trace replay ──────────────────────────────────────────────────
+    def _ask_trace(self, title):
+        path = filedialog.askopenfilename(
+            title=title, filetypes=[("Search traces", "*.pft"), ("All files", "*")])
+        if not path:
+            return None
+        try:
+            return tracefile.Trace(path)
+        except (OSError, ValueError) as exc:
+            self.renderer.status(f"Could not open trace: {exc}")
+            self.renderer.flush()
+            return None
+
+    def _drop_trace(self):
+        """Forget the loaded trace once the live grid no longer matches it."""
+        self.trace = self.other = None
+        self.scrub.config(state=tk.DISABLED, to=0)
+        self.play_btn.config(state=tk.DISABLED)
+        self.compare_btn.config(state=tk.DISABLED)
+
+    def open_trace(self):
+        """Load a recorded search (and its grid) and show its final state."""
+        trace = self._ask_trace("Open trace")
+        if trace is None:
+            return
+        if ((trace.rows, trace.cols, trace.start, trace.target) != (pf.ROWS, pf.COLS, pf.START, pf.TARGET)
+                or trace.grid != pf.grid[:pf.ROWS * pf.COLS]):
+            trace.load_grid()
+            self.renderer.reset()
+            self.planner = None
+        self.trace, self.other = trace, None
+        self.scrub.config(state=tk.NORMAL, to=len(trace))
+        self.play_btn.config(state=tk.NORMAL)
+        self.compare_btn.config(state=tk.NORMAL)
+        self.show_step(len(trace))
+
+    def save_trace(self):
+        """Write the last live run's events as a trace file."""
+        path = filedialog.asksaveasfilename(
+            title="Save trace", defaultextension=".pft",
+            filetypes=[("Search traces", "*.pft"), ("All files", "*")])
+        if not path:
+            return
+        try:
+            self.recorded.save(path)
+        except OSError as exc:
+            self.renderer.status(f"Could not save trace: {exc}")
+            self.renderer.flush()
+
+    def compare_trace(self):
+        """Load a second trace of the same grid to scrub alongside the first."""
+        other = self._ask_trace("Compare with trace")
+        if other is None:
+            return
+        if not self.trace.same_grid(other):
+            self.renderer.status("Traces were recorded on different grids ✗")
+            self.renderer.flush()
+            return
+        self.other = other
+        self.scrub.config(to=max(len(self.trace), len(other)))
+        self.play_btn.config(state=tk.DISABLED)
+        self.show_step(self.scrub_var.get())
+
+    def seek(self, value):
+        """Scrubber callback: jump the replay to an event index."""
+        step = int(float(value))
+        if isinstance(self.worker, TracePlayer):
+            if step == self.worker.position:
+                return              # the scrubber following playback
+            self.stop_search()
+        elif self.worker is not None or self.trace is None:
+            return
+        self.show_step(step)
+
+    def show_step(self, step):
+        """Show the loaded trace (or the comparison) after `step` events."""
+        trace, other, renderer = self.trace, self.other, self.renderer
+        step = max(0, min(step, max(len(trace), len(other or ()))))
+        self.scrub_var.set(step)
+        if other is not None:
+            renderer.clear(bidir=True)
+            marks = tracefile.compare_marks(trace, other, step)
+            renderer.load_marks(marks)
+            both  = tracefile.EXPLORED | tracefile.BWD_EXPLORED
+            renderer.status(f"step {step}:  {trace.algo} only {marks.count(tracefile.EXPLORED)}"
+                            f"  ·  {other.algo} only {marks.count(tracefile.BWD_EXPLORED)}"
+                            f"  ·  both {marks.count(both)}")
+        else:
+            count = len(trace)
+            self.animation = SearchAnimation(renderer, trace.algo, trace.options)
+            renderer.load_marks(trace.state_at(min(step, count - 1)))
+            self.animation.expanded = trace.expanded_at(step)
+            if step == count and count:
+                self.animation.feed(*trace.event(count - 1))
+            else:
+                renderer.status(f"{trace.algo} – replay  step {step}/{count}"
+                                f"  expanded={self.animation.expanded}")
+        renderer.flush()
+
+    def play_trace(self):
+        """Play the loaded trace from the scrubber position."""
+        step = self.scrub_var.get()
+        if step >= len(self.trace):
+            step = 0
+        self.show_step(step)
+        self._start_stats(self.trace.algo, self.trace.options)
+        self._start(TracePlayer(self.trace, step, self.stats))
+
+    # ── Run statistics ────────────────────────────────────────────────
+    def _start_stats(self, algo, options):
+        self.stats    = pf.SearchStats()
+        self.run_info = (algo, options)
+        self.stats_btn.config(state=tk.NORMAL)
+
+    def _show_stats(self):
+        self.stats_label.config(text=self.stats.summary())
+
+    def save_stats(self):
+        """Write the last run's counters and timers as JSON."""
+        path = filedialog.asksaveasfilename(
+            title="Save run statistics", defaultextension=".json",
+            filetypes=[("JSON", "*.json"), ("All files", "*")])
+        if not path:
+            return
+        algo, options = self.run_info
+        record = {"algo": algo, "options": options, "rows": pf.ROWS, "cols": pf.COLS,
+                  "start": list(pf.START), "target": list(pf.TARGET),
+                  "stats": self.stats.as_dict()}
+        try:
+            with open(path, "w", encoding="utf-8") as fh:
+                json.dump(record, fh, indent=1)
+        except OSError as exc:
+            self.renderer.status(f"Could not save stats: {exc}")
+            self.renderer.flush()
+
+    # ── Run / Stop callbacks ──────────────────────────────────────────
+    def search_options(self, algo):
+        """Extra search options for `algo` from the entries, or None if
+        they are invalid (the status bar then says why)."""
+        options = {}
+        if algo == "DLS":
+            try:
+                limit = int(self.depth_var.get())
+                if limit < 0:
+                    raise ValueError
+            except ValueError:
+                self.renderer.status("DLS – Please enter a valid depth limit (integer ≥ 0)")
+                self.renderer.flush()
+                return None
+            options["limit"] = limit
+        elif algo == "A*":
+            try:
+                weight = float(self.weight_var.get())
+                if weight < 1:
+                    raise ValueError
+            except ValueError:
+                self.renderer.status("A* – Please enter a valid weight (number ≥ 1)")
+                self.renderer.flush()
+                return None
+            options["weight"] = weight
+        return options
+
+    def open_compare(self):
+        """Open (or raise) the side-by-side compare window."""
+        if self.compare_window is None:
+            self.compare_window = CompareWindow(self)
+        else:
+            self.compare_window.window.deiconify()
+
+    def run_algorithm(self):
+        algo    = self.algo_var.get()
+        options = self.search_options(algo)
+        if options is None:
+            return
+
+        self.renderer.status("Starting…")
+        self._start_stats(algo, options)
+        self.animation  = SearchAnimation(self.renderer, algo, options)
+        self.renderer.flush()
+        self._start(SearchWorker(algo, options, self.stats, self.profile))
+
+    def _comparing(self):
+        """True while the compare window is running or playing engines."""
+        return self.compare_window is not None and self.compare_window.busy()
+
+    def compare_changed(self):
+        """The compare window started or finished: lock or free the controls."""
+        self._set_running(self.worker is not None)
+
+    def _set_running(self, running):
+        # A comparison locks everything that searches or changes the grid,
+        # and a search or replan here keeps the comparison from starting.
+        busy = running or self._comparing()
+        idle = tk.DISABLED if busy else tk.NORMAL
+        for button in (self.run_btn, self.open_btn, self.reset_btn, self.trace_btn):
+            button.config(state=idle)
+        self.stop_btn.config(state=tk.NORMAL if running else tk.DISABLED)
+        replay = tk.NORMAL if self.trace is not None and not busy else tk.DISABLED
+        self.compare_btn.config(state=replay)
+        self.play_btn.config(state=replay if self.other is None else tk.DISABLED)
+        if self.compare_window is not None:
+            self.compare_window.set_runnable(not running)
+
+    def _start(self, worker):
+        """Animate a SearchWorker or TracePlayer into self.animation."""
+        self._set_running(True)
+        self.worker     = worker
+        self.budget     = 0.0
+        self.batch      = 64
+        self.last_frame = time.perf_counter()
+        self.worker.start()
+        self.after_id   = self.root.after(FRAME_MS, self._drain)
+
+    def _drain(self):
+        """One animation frame: apply queued events, then paint once."""
+        now = time.perf_counter()
+        with self.stats.phase("render"):
+            if self.turbo_var.get() or self.replanning:
+                finished = self._drain_for(now + FRAME_BUDGET)
+            else:
+                self.budget    += (now - self.last_frame) * self.speed_var.get()
+                finished        = self._drain_steps()
+            self.last_frame = now
+            self.renderer.flush()
+        self._show_stats()
+        if isinstance(self.worker, TracePlayer):
+            self.scrub_var.set(self.worker.position)
+
+        if finished:
+            self._finish()
+        else:
+            self.after_id = self.root.after(FRAME_MS, self._drain)
+
+    def _take(self):
+        """Apply one queued event: its step cost, or IDLE / DONE."""
+        event = self.worker.next_event()
+        if event is IDLE or event is DONE:
+            return event
+        steps = self.animation.feed(*event)
+        return DONE if self.animation.done else steps
+
+    def _drain_steps(self):
+        """Paced mode: spend the steps-per-second budget accrued this frame."""
+        while self.budget >= 1:
+            steps = self._take()
+            if steps is DONE:
+                return True
+            if steps is IDLE:
+                self.budget = 1.0       # don't bank time while starved
+                break
+            self.budget -= steps
+        return False
+
+    def _drain_for(self, deadline):
+        """Max-speed mode: apply events in batches until the frame budget
+        is spent, skipping every intermediate frame in between.
+
+        The batch size adapts so the clock is read only a few times per
+        frame: it doubles while many batches fit and halves when a single
+        batch overruns the budget.
+        """
+        batches = 0
+        while True:
+            for _ in range(self.batch):
+                steps = self._take()
+                if steps is DONE:
+                    return True
+                if steps is IDLE:
+                    return False
+            batches += 1
+            if time.perf_counter() >= deadline:
+                break
+        if batches > 4:
+            self.batch *= 2
+        elif batches == 1 and self.batch > 16:
+            self.batch //= 2
+        return False
+
+    def stop_search(self):
+        if self.worker is not None:
+            self.worker.cancel()
+            self._finish(f"{self.animation.algo} – Stopped ■")
+
+    def _finish(self, status=None):
+        if self.after_id is not None:
+            self.root.after_cancel(self.after_id)
+            self.after_id = None
+        if self.worker.error is not None:
+            status = f"{self.animation.algo} – Error: {self.worker.error}"
+        if self.replanning:
+            self.replanning = False
+            if status is None:
+                status = self._replan_status()
+            else:
+                self.planner = None     # stopped mid-repair: its state is partial
+        if status:
+            self.renderer.status(status)
+        self.renderer.flush()
+        self._show_stats()
+        if isinstance(self.worker, SearchWorker):
+            if self.worker.recorder is not None:
+                self.recorded = self.worker.recorder
+                self.save_trace_btn.config(state=tk.NORMAL)
+        else:
+            self.scrub_var.set(self.worker.position)
+        self.worker = None
+        self._set_running(False)
+
+
+def main(algo="BFS", profile=None):
+    root = tk.Tk()
+    PathfinderApp(root, algo, profile)
+    root.mainloop()
@@ -0,0 +1,501 @@
+"""Hierarchical pathfinding (HPA*) over the live grid, for very large maps.
+
+The grid is cut into CLUSTER_SIZE × CLUSTER_SIZE clusters.  Where two
+neighbouring clusters touch, every run of open cell pairs straight across
+the border gets one transition (two, at the run's ends, for long runs); a
+diagonal crossing only gets its own transition when both cells beside it
+are walls, since otherwise a straight crossing next to it does the same
+job.  Transition cells are the nodes of a small abstract graph; within a
+cluster they are joined by their precomputed shortest distances.
+
+A query links start and target into that graph, searches it with A*, and
+then refines only the clusters the abstract path passes through.  Paths
+are near-optimal rather than optimal: they are forced through transition
+cells.
+
+    import Pathfinder, hierarchy
+    Pathfinder.load_map("big.pfm")
+    hpa = hierarchy.load_or_build("big.hpa")
+    hpa.find_path((0, 0), (1999, 1999))     # {"path", "cost", "expanded"}
+    hpa.set_wall(10, 20)                    # re-derives two or three clusters
+    hpa.save("big.hpa")
+"""
+import argparse
+import heapq
+import json
+import os
+import random
+import struct
+import sys
+from array import array
+
+import Pathfinder as pf
+
+CLUSTER_SIZE = 32
+LONG_RUN     = 6        # runs this long get a transition at each end
+
+MAGIC   = b"PFHA"
+VERSION = 1
+HEADER  = struct.Struct("<4sB3xIIIII16s")
+
+if not pf.SYMMETRIC_MOVES:
+    raise ImportError("hierarchy.py assumes every move can be reversed")
+
+
+def _cluster_search(bounds, source, stop=None):
+    """Dijkstra from `source` confined to the cells inside `bounds`.
+
+    bounds = (row0, row1, col0, col1), half-open.  Returns (dist, parent,
+    expanded) as dicts keyed by cell id; stops early once `stop` settles.
+    """
+    row0, row1, col0, col1 = bounds
+    nbr_count, nbr_node, nbr_cost = pf.neighbor_table()
+    stride, cols = pf.NBR_STRIDE, pf.COLS
+    dist     = {source: 0.0}
+    parent   = {source: -1}
+    heap     = [(0.0, source)]
+    expanded = 0
+    while heap:
+        d, u = heapq.heappop(heap)
+        if d > dist[u]:
+            continue                    # stale entry
+        expanded += 1
+        if u == stop:
+            break
+        base = u * stride
+        end  = base + nbr_count[u]
+        for v, move_cost in zip(nbr_node[base:end], nbr_cost[base:end]):
+            r, c = divmod(v, cols)
+            if row0 <= r < row1 and col0 <= c < col1:
+                nd = d + move_cost
+                if nd < dist.get(v, pf.INF):
+                    dist[v]   = nd
+                    parent[v] = u
+                    heapq.heappush(heap, (nd, v))
+    return dist, parent, expanded
+
+
+def _local_graph(bounds):
+    """The cells inside `bounds` renumbered 0…n-1, with their in-bounds
+    neighbour lists: ({cell id: local id}, [[(local id, cost), …], …])."""
+    row0, row1, col0, col1 = bounds
+    nbr_count, nbr_node, nbr_cost = pf.neighbor_table()
+    stride, cols = pf.NBR_STRIDE, pf.COLS
+    local = {r * cols + c: i for i, (r, c) in enumerate(
+        (r, c) for r in range(row0, row1) for c in range(col0, col1))}
+    adj = []
+    for u in local:
+        base = u * stride
+        end  = base + nbr_count[u]
+        adj.append([(local[v], cost)
+                    for v, cost in zip(nbr_node[base:end], nbr_cost[base:end])
+                    if v in local])
+    return local, adj
+
+
+def _local_costs(adj, source, targets):
+    """Dijkstra over a _local_graph, stopping once every target settles."""
+    dist    = [pf.INF] * len(adj)
+    dist[source] = 0.0
+    pending = set(targets)
+    heap    = [(0.0, source)]
+    while heap and pending:
+        d, u = heapq.heappop(heap)
+        if d > dist[u]:
+            continue
+        pending.discard(u)
+        for v, cost in adj[u]:
+            if d + cost < dist[v]:
+                dist[v] = d + cost
+                heapq.heappush(heap, (d + cost, v))
+    return dist
+
+
+def _little_endian(arr):
+    if sys.byteorder == "big":
+        arr = array(arr.typecode, arr)
+        arr.byteswap()
+    return arr
+
+
+class Hierarchy:
+    """Clusters, transitions and intra-cluster distances for the live grid."""
+
+    def __init__(self, size=CLUSTER_SIZE):
+        self.size  = size
+        self.crows = -(-pf.ROWS // size)
+        self.ccols = -(-pf.COLS // size)
+        self.borders = {}       # (cluster a, cluster b) → [(u, v, cost)], u in a
+        self.links   = {}       # u → {v: cost} across borders
+        self.intra   = {}       # cluster → {u: [(v, cost)]} within it
+        self.grid_hash = None
+
+    # ── Geometry ──────────────────────────────────────────────────────
+    def cluster_of(self, u):
+        r, c = divmod(u, pf.COLS)
+        return (r // self.size) * self.ccols + c // self.size
+
+    def bounds(self, cluster):
+        ci, cj = divmod(cluster, self.ccols)
+        k = self.size
+        return (ci * k, min(ci * k + k, pf.ROWS), cj * k, min(cj * k + k, pf.COLS))
+
+    def _incident(self, cluster):
+        """Keys of the borders `cluster` shares with its neighbours."""
+        ci, cj = divmod(cluster, self.ccols)
+        for di, dj in ((0, 1), (1, 0), (1, 1)):
+            for sign in (1, -1):
+                oi, oj = ci + sign * di, cj + sign * dj
+                if 0 <= oi < self.crows and 0 <= oj < self.ccols:
+                    other = oi * self.ccols + oj
+                    yield (cluster, other) if sign > 0 else (other, cluster)
+
+    def nodes(self, cluster):
+        """Transition cells inside `cluster`."""
+        found = set()
+        for key in self._incident(cluster):
+            for u, v, _ in self.borders.get(key, ()):
+                found.add(u if key[0] == cluster else v)
+        return found
+
+    # ── Building ──────────────────────────────────────────────────────
+    @classmethod
+    def build(cls, size=CLUSTER_SIZE):
+        """Precompute the hierarchy for the live grid."""
+        self = cls(size)
+        clusters = range(self.crows * self.ccols)
+        for a in clusters:
+            for key in self._incident(a):
+                if key[0] == a:
+                    self.borders[key] = self._border(*key)
+        for key in self.borders:
+            self._link(key)
+        for cluster in clusters:
+            self._connect(cluster)
+        self.grid_hash = pf.grid_hash()
+        return self
+
+    def _border(self, a, b):
+        """Transitions from cluster a to cluster b, which lies to its right,
+        below it, or diagonally below-right."""
+        grid, cols, k = pf.grid, pf.COLS, self.size
+        (ai, aj), (bi, bj) = divmod(a, self.ccols), divmod(b, self.ccols)
+        row0, row1, col0, col1 = self.bounds(a)
+        if bi == ai:            # vertical border: a's last column
+            c = bj * k - 1
+            straight = [(r * cols + c, r * cols + c + 1) for r in range(row0, row1)]
+            corners  = [r * cols + c for r in range(row0, row1 - 1)]
+        elif bj == aj:          # horizontal border: a's last row
+            r = bi * k - 1
+            straight = [(r * cols + c, (r + 1) * cols + c) for c in range(col0, col1)]
+            corners  = [r * cols + c for c in range(col0, col1 - 1)]
+        else:                   # a's bottom-right corner cell
+            straight = []
+            corners  = [(bi * k - 1) * cols + bj * k - 1]
+
+        out, run = [], []
+        for u, v in straight + [(None, None)]:
+            if u is not None and not grid[u] and not grid[v]:
+                run.append((u, v))
+                continue
+            if len(run) >= LONG_RUN:
+                out += [(*run[0], 1.0), (*run[-1], 1.0)]
+            elif run:
+                out.append((*run[len(run) // 2], 1.0))
+            run = []
+        for u in corners:
+            v = u + cols + 1
+            if (not grid[u] and not grid[v]
+                    and grid[u + 1] and grid[u + cols]):
+                out.append((u, v, pf.DIAG_COST))
+        return out
+
+    def _link(self, key, drop=()):
+        """Index a border's transitions in self.links (after removing the
+        `drop` transitions it used to have)."""
+        links = self.links
+        for u, v, _ in drop:
+            for x, y in ((u, v), (v, u)):
+                links[x].pop(y, None)
+                if not links[x]:
+                    del links[x]
+        for u, v, cost in self.borders[key]:
+            links.setdefault(u, {})[v] = cost
+            links.setdefault(v, {})[u] = cost
+
+    def _connect(self, cluster):
+        """Shortest in-cluster distances between the cluster's nodes."""
+        nodes = sorted(self.nodes(cluster))
+        edges = {u: [] for u in nodes}
+        if len(nodes) > 1:
+            local, adj = _local_graph(self.bounds(cluster))
+            ids = [local[u] for u in nodes]
+            for i, u in enumerate(nodes[:-1]):
+                dist = _local_costs(adj, ids[i], ids[i + 1:])
+                for v, j in zip(nodes[i + 1:], ids[i + 1:]):
+                    if dist[j] < pf.INF:
+                        edges[u].append((v, dist[j]))
+                        edges[v].append((u, dist[j]))
+        self.intra[cluster] = edges
+
+    # ── Wall edits ────────────────────────────────────────────────────
+    def set_wall(self, row, col, wall=True):
+        """Edit the live grid (Pathfinder.set_wall) and re-derive only the
+        clusters the edit can affect."""
+        self._refresh()
+        pf.set_wall(row, col, wall)
+        self.update_cell(row * pf.COLS + col)
+        self.grid_hash = pf.grid_hash()
+
+    def update_cell(self, u):
+        """Bring the hierarchy up to date after cell u changed."""
+        cluster = self.cluster_of(u)
+        ci, cj  = divmod(cluster, self.ccols)
+        keys    = set(self._incident(cluster))
+        # A corner crossing also looks at the two cells beside it, which
+        # lie in the clusters right-above and left-below of its ends.
+        for ai, aj in ((ci, cj - 1), (ci - 1, cj)):
+            if 0 <= ai < self.crows - 1 and 0 <= aj < self.ccols - 1:
+                keys.add((ai * self.ccols + aj, (ai + 1) * self.ccols + aj + 1))
+
+        touched = {c for key in keys for c in key}
+        before  = {c: self.nodes(c) for c in touched}
+        for key in keys:
+            old = self.borders[key]
+            self.borders[key] = self._border(*key)
+            self._link(key, drop=old)
+        for c in touched:
+            if c == cluster or self.nodes(c) != before[c]:
+                self._connect(c)
+
+    def same_as(self, other):
+        """True if both hierarchies have the same transitions and distances,
+        however they were derived."""
+        def canonical(hpa):
+            borders = {key: sorted(found) for key, found in hpa.borders.items() if found}
+            intra   = {cluster: {u: sorted(edges) for u, edges in nodes.items()}
+                       for cluster, nodes in hpa.intra.items() if nodes}
+            return hpa.size, borders, hpa.links, intra
+        return canonical(self) == canonical(other)
+
+    def _refresh(self):
+        """Rebuild from scratch if the live grid changed behind our back."""
+        if self.grid_hash != pf.grid_hash():
+            fresh = Hierarchy.build(self.size)
+            self.__dict__.update(fresh.__dict__)
+
+    # ── Queries ───────────────────────────────────────────────────────
+    def find_path(self, start=None, target=None):
+        """Near-optimal path from start to target: a dict like
+        Pathfinder.solve() returns, with expanded counting both levels."""
+        start  = pf.START if start is None else tuple(start)
+        target = pf.TARGET if target is None else tuple(target)
+        if not pf.reachable(start, target):
+            return {"path": None, "cost": None, "expanded": 0}
+        self._refresh()
+        s, t = pf.node_id(*start), pf.node_id(*target)
+        cs, ct = self.cluster_of(s), self.cluster_of(t)
+
+        # Link start and target into the abstract graph
+        dist_s, _, expanded = _cluster_search(self.bounds(cs), s)
+        dist_t, _, more     = _cluster_search(self.bounds(ct), t)
+        expanded += more
+        from_s = [(v, dist_s[v]) for v in self.nodes(cs) if v in dist_s]
+        if t in dist_s:
+            from_s.append((t, dist_s[t]))
+        into_t = {v: dist_t[v] for v in self.nodes(ct) if v in dist_t}
+
+        route, more = self._abstract_search(s, t, from_s, into_t)
+        expanded += more
+        if route is None:
+            return {"path": None, "cost": None, "expanded": expanded}
+
+        # Refine: straight across borders, a confined search within clusters
+        cells = [s]
+        for a, b in zip(route, route[1:]):
+            cluster = self.cluster_of(a)
+            if cluster != self.cluster_of(b):
+                cells.append(b)
+                continue
+            _, parent, more = _cluster_search(self.bounds(cluster), a, stop=b)
+            expanded += more
+            leg = []
+            while b != a:
+                leg.append(b)
+                b = parent[b]
+            cells += reversed(leg)
+        path = [pf.cell_of(u) for u in cells]
+        return {"path": path, "cost": pf.path_cost(path), "expanded": expanded}
+
+    def _abstract_search(self, s, t, from_s, into_t):
+        """A* over transition nodes; returns (node route, expansions)."""
+        g, parent = {s: 0.0}, {s: None}
+        heap      = [(pf.cost_distance(s, t), s)]
+        closed    = set()
+        while heap:
+            _, u = heapq.heappop(heap)
+            if u in closed:
+                continue
+            closed.add(u)
+            if u == t:
+                route = []
+                while u is not None:
+                    route.append(u)
+                    u = parent[u]
+                return route[::-1], len(closed)
+            edges = from_s if u == s else self.intra[self.cluster_of(u)].get(u, [])
+            edges = list(edges) + list(self.links.get(u, {}).items())
+            if u in into_t:
+                edges.append((t, into_t[u]))
+            for v, cost in edges:
+                new_cost = g[u] + cost
+                if new_cost < g.get(v, pf.INF):
+                    g[v], parent[v] = new_cost, u
+                    heapq.heappush(heap, (new_cost + pf.cost_distance(v, t), v))
+        return None, len(closed)
+
+    # ── Persistence ───────────────────────────────────────────────────
+    def save(self, path):
+        """Write the hierarchy, tagged with the grid it was built for."""
+        self._refresh()
+        trans_nodes, trans_cost = array('i'), array('d')
+        for border in self.borders.values():
+            for u, v, cost in border:
+                trans_nodes += array('i', (u, v))
+                trans_cost.append(cost)
+        intra_nodes, intra_cost = array('i'), array('d')
+        for edges in self.intra.values():
+            for u, out in edges.items():
+                for v, cost in out:
+                    if u < v:
+                        intra_nodes += array('i', (u, v))
+                        intra_cost.append(cost)
+        with open(path, "wb") as fh:
+            fh.write(HEADER.pack(MAGIC, VERSION, pf.ROWS, pf.COLS, self.size,
+                                 len(trans_cost), len(intra_cost),
+                                 bytes.fromhex(self.grid_hash)))
+            for arr in (trans_nodes, trans_cost, intra_nodes, intra_cost):
+                fh.write(_little_endian(arr).tobytes())
+
+    @classmethod
+    def load(cls, path):
+        """Read a saved hierarchy; it must match the live grid."""
+        with open(path, "rb") as fh:
+            data = fh.read()
+        if len(data) < HEADER.size:
+            raise ValueError(f"{path}: too short for a hierarchy header")
+        magic, version, rows, cols, size, n_trans, n_intra, digest = \
+            HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path}: not a version {VERSION} hierarchy file")
+        if digest.hex() != pf.grid_hash():
+            raise ValueError(f"{path}: built for a different grid")
+
+        arrays, at = [], HEADER.size
+        for typecode, count in (('i', 2 * n_trans), ('d', n_trans),
+                                ('i', 2 * n_intra), ('d', n_intra)):
+            arr   = array(typecode)
+            chunk = data[at:at + count * arr.itemsize]
+            if len(chunk) != count * arr.itemsize:
+                raise ValueError(f"{path}: truncated hierarchy file")
+            arr.frombytes(chunk)
+            at += len(chunk)
+            arrays.append(_little_endian(arr))
+        if at != len(data):
+            raise ValueError(f"{path}: {len(data) - at} unexpected bytes after the edges")
+        trans_nodes, trans_cost, intra_nodes, intra_cost = arrays
+
+        self = cls(size)
+        for cluster in range(self.crows * self.ccols):
+            self.intra[cluster] = {}
+            for key in self._incident(cluster):
+                if key[0] == cluster:
+                    self.borders[key] = []
+        for i, cost in enumerate(trans_cost):
+            u, v = trans_nodes[2 * i], trans_nodes[2 * i + 1]
+            self.borders[self.cluster_of(u), self.cluster_of(v)].append((u, v, cost))
+        for key in self.borders:
+            self._link(key)
+        for cluster in self.intra:
+            self.intra[cluster] = {u: [] for u in self.nodes(cluster)}
+        for i, cost in enumerate(intra_cost):
+            u, v  = intra_nodes[2 * i], intra_nodes[2 * i + 1]
+            edges = self.intra[self.cluster_of(u)]
+            edges[u].append((v, cost))
+            edges[v].append((u, cost))
+        self.grid_hash = digest.hex()
+        return self
+
+
+def load_or_build(path, size=CLUSTER_SIZE):
+    """The saved hierarchy at `path` if it fits the live grid, otherwise a
+    fresh one (which is then saved there)."""
+    if os.path.exists(path):
+        try:
+            found = Hierarchy.load(path)
+            if found.size == size:
+                return found
+        except ValueError:
+            pass
+    built = Hierarchy.build(size)
+    built.save(path)
+    return built
+
+
+def check_edits(hpa, edits, seed=None):
+    """Toggle `edits` random cells through hpa.set_wall(), comparing the
+    result with a full rebuild after each; returns how many differed."""
+    rng    = random.Random(seed)
+    keep   = {pf.START, pf.TARGET}
+    failed = 0
+    for _ in range(edits):
+        cell = (rng.randrange(pf.ROWS), rng.randrange(pf.COLS))
+        if cell in keep:
+            continue
+        hpa.set_wall(*cell, not pf.is_wall(*cell))
+        failed += not hpa.same_as(Hierarchy.build(hpa.size))
+    return failed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Build (or reuse) an HPA* hierarchy and answer one query.")
+    parser.add_argument("map", help="text or binary map file")
+    parser.add_argument("--cache", help="hierarchy file to reuse or create")
+    parser.add_argument("--cluster", type=int, default=CLUSTER_SIZE)
+    parser.add_argument("--start", type=pf._cell_arg, help="ROW,COL")
+    parser.add_argument("--target", type=pf._cell_arg, help="ROW,COL")
+    parser.add_argument("--check-edits", type=int, default=0, metavar="N",
+                        help="after the query, make N random wall edits and check each"
+                             " against a full rebuild (exit status 1 on a mismatch)")
+    parser.add_argument("--seed", type=int, help="random seed for --check-edits")
+    args = parser.parse_args(argv)
+
+    pf.load_map(args.map)
+    for option, cell in (("--start", args.start), ("--target", args.target)):
+        if cell is not None:
+            pf._check_cell(parser, option, cell)
+    if args.cache:
+        hpa = load_or_build(args.cache, args.cluster)
+    else:
+        hpa = Hierarchy.build(args.cluster)
+    result = hpa.find_path(args.start, args.target)
+    path   = result["path"]
+    failed = check_edits(hpa, args.check_edits, args.seed) if args.check_edits else 0
+    json.dump({
+        "map"      : args.map,
+        "clusters" : hpa.crows * hpa.ccols,
+        "nodes"    : len(hpa.links),
+        "found"    : path is not None,
+        "length"   : len(path) if path else None,
+        "cost"     : round(result["cost"], 6) if path else None,
+        "expanded" : result["expanded"],
+        **({"edits_checked": args.check_edits, "edits_failed": failed}
+           if args.check_edits else {}),
+    }, sys.stdout)
+    sys.stdout.write("\n")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,215 @@
+"""Binary map files: a fixed header and a wall plane, opened with mmap.
+
+Layout (little-endian):
+
+    offset  size
+         0     4   magic  b"PFMP"
+         4     1   format version (1)
+         5     1   flags: bit 0 set = bit-packed plane
+         6     2   reserved (0)
+         8     8   rows, cols                   (uint32 each)
+        16    16   start row/col, target row/col (int32 each)
+        32     …   wall plane, row-major, one row after another
+
+The plane holds either one byte per cell (0 open, 1 wall) or, when
+packed, one bit per cell with each row padded to whole bytes; cell c of
+a row is bit c % 8 of byte c // 8.
+
+Opening a map only maps the file: nothing is parsed or copied, and a
+byte-per-cell plane serves as Pathfinder's live grid in place
+(Pathfinder.load_map does this); a packed plane is eight times smaller
+on disk and is unpacked when loaded.  Only the raw wall plane is paged:
+the first search reads all of it and builds the neighbour table and
+reachability labels for every cell as ordinary arrays, about 77 bytes
+per cell.
+
+    python mapfile.py maps/example.txt example.pfm [--packed]   # text → binary
+    python mapfile.py example.pfm example.txt                   # binary → text
+"""
+import argparse
+import mmap
+import struct
+import sys
+
+import Pathfinder as pf
+
+MAGIC        = b"PFMP"
+VERSION      = 1
+FLAG_PACKED  = 1
+HEADER       = struct.Struct("<4sBBHIIiiii")
+
+_BITS        = bytes.maketrans(b"\x00\x01", b"01")
+_TEXT        = bytes.maketrans(b"\x00\x01", b".#")
+_UNPACKED    = [bytes((byte >> bit) & 1 for bit in range(8)) for byte in range(256)]
+
+
+def is_binary(path):
+    """True if `path` starts with the binary map magic."""
+    with open(path, "rb") as fh:
+        return fh.read(len(MAGIC)) == MAGIC
+
+
+def _row_stride(cols, packed):
+    return (cols + 7) // 8 if packed else cols
+
+
+def _pack_row(row, stride):
+    """One row of 0/1 cell bytes as its bit-packed plane row."""
+    return int(row.translate(_BITS)[::-1] or b"0", 2).to_bytes(stride, "little")
+
+
+# ──────────────────────────────────────────
+#  READING
+# ──────────────────────────────────────────
+
+class MapFile:
+    """A binary map file, memory-mapped read-only."""
+
+    def __init__(self, path):
+        with open(path, "rb") as fh:
+            self.mm = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self.mm) < HEADER.size:
+            raise ValueError(f"{path}: too short for a map header")
+        magic, version, flags, _, rows, cols, *cells = HEADER.unpack_from(self.mm)
+        if magic != MAGIC:
+            raise ValueError(f"{path}: not a binary map file")
+        if version != VERSION:
+            raise ValueError(f"{path}: unsupported map version {version}")
+
+        self.path   = path
+        self.rows   = rows
+        self.cols   = cols
+        self.start  = tuple(cells[:2])
+        self.target = tuple(cells[2:])
+        self.packed = bool(flags & FLAG_PACKED)
+        self.stride = _row_stride(cols, self.packed)
+        end = HEADER.size + rows * self.stride
+        if len(self.mm) < end:
+            raise ValueError(f"{path}: truncated wall plane")
+        self.plane  = memoryview(self.mm)[HEADER.size:end]
+
+    @property
+    def cells(self):
+        """The byte-per-cell plane as a read-only buffer (no copy)."""
+        if self.packed:
+            raise ValueError(f"{self.path}: packed plane, use unpack()")
+        return self.plane
+
+    def unpack(self):
+        """All cells as a fresh bytearray, one byte per cell."""
+        if not self.packed:
+            return bytearray(self.plane)
+        return bytearray().join(map(self.row, range(self.rows)))
+
+    def row(self, r):
+        """The cells of row r as bytes, one per cell."""
+        at = r * self.stride
+        if not self.packed:
+            return bytes(self.plane[at:at + self.cols])
+        return b"".join(map(_UNPACKED.__getitem__, self.plane[at:at + self.stride]))[:self.cols]
+
+    def close(self):
+        """Unmap the file; fails while its plane is still the live grid."""
+        self.plane.release()
+        self.mm.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# ──────────────────────────────────────────
+#  WRITING
+# ──────────────────────────────────────────
+
+def _write_header(fh, rows, cols, start, target, packed):
+    start  = (0, 0) if start is None else start
+    target = (rows - 1, cols - 1) if target is None else target
+    fh.write(HEADER.pack(MAGIC, VERSION, FLAG_PACKED if packed else 0, 0,
+                         rows, cols, *start, *target))
+
+
+def write_map(path, cells, rows, cols, start=None, target=None, packed=False):
+    """Write flat 0/1 cells (row-major) as a binary map file."""
+    if len(cells) != rows * cols:
+        raise ValueError(f"expected {rows * cols} cells, got {len(cells)}")
+    with open(path, "wb") as fh:
+        _write_header(fh, rows, cols, start, target, packed)
+        if not packed:
+            fh.write(cells)
+            return
+        stride = _row_stride(cols, packed)
+        for at in range(0, rows * cols, cols):
+            fh.write(_pack_row(bytes(cells[at:at + cols]), stride))
+
+
+def text_to_binary(src, dst, packed=False):
+    """Convert a text map to a binary one, a row at a time.
+
+    The text file is read twice (once for its size) and never held in
+    memory as a whole.
+    """
+    rows = cols = blank = 0
+    with open(src, encoding="utf-8") as fh:
+        for line in fh:
+            line = line.rstrip("\r\n")
+            if line.strip():
+                rows += blank + 1
+                blank = 0
+            else:
+                blank += 1
+            cols = max(cols, len(line))
+    if not rows:
+        raise ValueError(f"{src}: empty map")
+
+    start = target = None
+    stride = _row_stride(cols, packed)
+    with open(src, encoding="utf-8") as fh, open(dst, "wb") as out:
+        _write_header(out, rows, cols, None, None, packed)
+        for r, line in zip(range(rows), fh):
+            line = line.rstrip("\r\n").ljust(cols)
+            row  = line.translate(pf.MAP_CELLS)
+            bad  = row.strip("\x00\x01")
+            if bad:
+                raise ValueError(f"{src}:{r + 1}: unexpected {bad[0]!r}")
+            if "S" in line:
+                start = (r, line.index("S"))
+            if "T" in line:
+                target = (r, line.index("T"))
+            row = row.encode("latin-1")
+            out.write(_pack_row(row, stride) if packed else row)
+        out.seek(0)
+        _write_header(out, rows, cols, start, target, packed)
+
+
+def binary_to_text(src, dst):
+    """Convert a binary map back to a text map, a row at a time."""
+    with MapFile(src) as binary, open(dst, "w", encoding="utf-8") as out:
+        for r in range(binary.rows):
+            line = list(binary.row(r).translate(_TEXT).decode("ascii"))
+            for (row, col), mark in ((binary.start, "S"), (binary.target, "T")):
+                if row == r:
+                    line[col] = mark
+            out.write("".join(line) + "\n")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Convert maps between the text and binary formats.")
+    parser.add_argument("src", help="text or binary map")
+    parser.add_argument("dst", help="output map, in the other format")
+    parser.add_argument("--packed", action="store_true",
+                        help="bit-packed wall plane (text → binary only)")
+    args = parser.parse_args(argv)
+
+    if is_binary(args.src):
+        binary_to_text(args.src, args.dst)
+    else:
+        text_to_binary(args.src, args.dst, args.packed)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,334 @@
+"""Search traces: record an event stream once, replay and scrub it later.
+
+A trace holds everything needed to show a finished search again without
+re-running it: the grid it ran on, and its event stream with the event
+kinds, delta-encoded cell ids and values in flat arrays.  Every
+KEYFRAME_EVERY events the file also keeps a keyframe, the cell marks at
+that point, so seeking to any step replays at most one interval.
+
+Layout (little-endian):
+
+    offset  size
+         0     4   magic  b"PFTR"
+         4     1   format version (1)
+         5     3   reserved (0)
+         8     8   rows, cols                    (uint32 each)
+        16    16   start row/col, target row/col (int32 each)
+        32     8   event count, keyframe interval (uint32 each)
+        40     …   sections, each a uint32 length and zlib-compressed data:
+                   meta (JSON: algo, options), grid, kinds (uint8),
+                   node deltas (int32), values (float64), path (int32),
+                   then a uint32 keyframe count and one section per keyframe
+
+    python tracefile.py info run.pft
+    python tracefile.py compare bfs.pft astar.pft
+"""
+import argparse
+import json
+import math
+import struct
+import sys
+import zlib
+from array import array
+from itertools import accumulate, compress
+
+import Pathfinder as pf
+
+MAGIC          = b"PFTR"
+VERSION        = 1
+HEADER         = struct.Struct("<4sB3xIIiiiiII")
+LENGTH         = struct.Struct("<I")
+KEYFRAME_EVERY = 4096
+
+# Cell marks, folded from the events (the same bits as gui's MARK_*)
+FRONTIER     = 1
+EXPLORED     = 2
+BWD_FRONTIER = 4
+BWD_EXPLORED = 8
+
+
+def fold(marks, kind, node):
+    """Apply one event to a bytearray of cell marks, as the GUI draws it."""
+    if kind == pf.EV_LIMIT:
+        marks[:] = bytes(len(marks))
+        return
+    if kind & pf.EV_BWD:
+        frontier, explored = BWD_FRONTIER, BWD_EXPLORED
+    else:
+        frontier, explored = FRONTIER, EXPLORED
+    kind &= ~pf.EV_BWD
+    if kind == pf.EV_PUSH:
+        marks[node] |= frontier
+    elif kind == pf.EV_EXPAND:
+        marks[node] = marks[node] & ~frontier | explored
+    elif kind == pf.EV_DISCARD:
+        marks[node] &= ~frontier
+
+
+def _little(arr):
+    """An array's bytes in little-endian order."""
+    if sys.byteorder == "big":
+        arr = array(arr.typecode, arr)
+        arr.byteswap()
+    return arr.tobytes()
+
+
+def _from_little(typecode, data):
+    arr = array(typecode)
+    arr.frombytes(data)
+    if sys.byteorder == "big":
+        arr.byteswap()
+    return arr
+
+
+# ──────────────────────────────────────────
+#  RECORDING
+# ──────────────────────────────────────────
+
+class TraceRecorder:
+    """Collects one search's events on the live grid, ready to save.
+
+    Create it before the search starts (it snapshots the grid) and pass
+    every event to add().
+    """
+
+    def __init__(self, algo, options=None, start=None, target=None):
+        self.algo    = algo
+        self.options = dict(options or {})
+        self.rows    = pf.ROWS
+        self.cols    = pf.COLS
+        self.start   = pf.START if start is None else start
+        self.target  = pf.TARGET if target is None else target
+        self.grid    = bytes(pf.grid[:pf.ROWS * pf.COLS])
+        self.kinds   = array('B')
+        self.deltas  = array('i')
+        self.values  = array('d')
+        self.path    = array('i')
+        self.last    = 0
+
+    def __len__(self):
+        return len(self.kinds)
+
+    def nbytes(self):
+        """Memory held by the recorded arrays."""
+        return sum(map(sys.getsizeof, (self.kinds, self.deltas, self.values, self.path)))
+
+    def add(self, kind, node, value):
+        if kind == pf.EV_FOUND:
+            self.path.extend(r * self.cols + c for r, c in node)
+            node = None
+        self.kinds.append(kind)
+        if node is None:
+            self.deltas.append(0)
+        else:
+            self.deltas.append(node - self.last)
+            self.last = node
+        self.values.append(math.nan if value is None else value)
+
+    def keyframes(self, interval=KEYFRAME_EVERY):
+        """Compressed cell marks before every `interval`-th event."""
+        marks     = bytearray(self.rows * self.cols)
+        keyframes = []
+        node      = 0
+        for i, (kind, delta) in enumerate(zip(self.kinds, self.deltas)):
+            if i % interval == 0:
+                keyframes.append(zlib.compress(marks))
+            node += delta
+            fold(marks, kind, node)
+        return keyframes
+
+    def trace(self, interval=KEYFRAME_EVERY):
+        """The recording as a Trace, without a round trip through a file."""
+        return Trace.from_recorder(self, interval)
+
+    def save(self, path, interval=KEYFRAME_EVERY):
+        """Write the trace file, computing its keyframes on the way."""
+        keyframes = self.keyframes(interval)
+        meta = json.dumps({"algo": self.algo, "options": self.options}).encode()
+        with open(path, "wb") as fh:
+            fh.write(HEADER.pack(MAGIC, VERSION, self.rows, self.cols, *self.start,
+                                 *self.target, len(self.kinds), interval))
+            for data in (meta, self.grid, self.kinds.tobytes(), _little(self.deltas),
+                         _little(self.values), _little(self.path)):
+                data = zlib.compress(data)
+                fh.write(LENGTH.pack(len(data)) + data)
+            fh.write(LENGTH.pack(len(keyframes)))
+            for data in keyframes:
+                fh.write(LENGTH.pack(len(data)) + data)
+
+
+# ──────────────────────────────────────────
+#  READING
+# ──────────────────────────────────────────
+
+class Trace:
+    """A recorded search, loaded for replay.
+
+    event(i) rebuilds the i-th (kind, node, value) event exactly as the
+    search yielded it; state_at(step) gives the cell marks after `step`
+    events, starting from the nearest keyframe.
+    """
+
+    def __init__(self, path):
+        with open(path, "rb") as fh:
+            data = fh.read()
+        if len(data) < HEADER.size or data[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path}: not a trace file")
+        _, version, rows, cols, sr, sc, tr, tc, count, interval = HEADER.unpack_from(data)
+        if version != VERSION:
+            raise ValueError(f"{path}: unsupported trace version {version}")
+
+        at = HEADER.size
+        def section():
+            nonlocal at
+            (size,) = LENGTH.unpack_from(data, at)
+            at += LENGTH.size + size
+            if at > len(data):
+                raise ValueError(f"{path}: truncated trace")
+            return data[at - size:at]
+
+        meta          = json.loads(zlib.decompress(section()))
+        self.algo     = meta["algo"]
+        self.options  = meta["options"]
+        self.rows     = rows
+        self.cols     = cols
+        self.start    = (sr, sc)
+        self.target   = (tr, tc)
+        self.interval = interval
+        self.grid     = bytearray(zlib.decompress(section()))
+        self.kinds    = zlib.decompress(section())
+        self.nodes    = array('i', accumulate(_from_little('i', zlib.decompress(section()))))
+        self.values   = _from_little('d', zlib.decompress(section()))
+        self.path     = [divmod(u, cols) for u in _from_little('i', zlib.decompress(section()))]
+        (frames,)     = LENGTH.unpack_from(data, at)
+        at           += LENGTH.size
+        self.keyframes = [section() for _ in range(frames)]
+        if len(self.kinds) != count or len(self.nodes) != count:
+            raise ValueError(f"{path}: event count mismatch")
+
+    @classmethod
+    def from_recorder(cls, recorder, interval=KEYFRAME_EVERY):
+        trace           = cls.__new__(cls)
+        trace.algo      = recorder.algo
+        trace.options   = recorder.options
+        trace.rows      = recorder.rows
+        trace.cols      = recorder.cols
+        trace.start     = tuple(recorder.start)
+        trace.target    = tuple(recorder.target)
+        trace.interval  = interval
+        trace.grid      = bytearray(recorder.grid)
+        trace.kinds     = recorder.kinds.tobytes()
+        trace.nodes     = array('i', accumulate(recorder.deltas))
+        trace.values    = recorder.values
+        trace.path      = [divmod(u, recorder.cols) for u in recorder.path]
+        trace.keyframes = recorder.keyframes(interval)
+        return trace
+
+    def __len__(self):
+        return len(self.kinds)
+
+    def event(self, i):
+        kind  = self.kinds[i]
+        value = self.values[i]
+        value = None if math.isnan(value) else int(value) if value.is_integer() else value
+        if kind == pf.EV_FOUND:
+            return kind, list(self.path), value
+        if kind in (pf.EV_FAIL, pf.EV_LIMIT):
+            return kind, None, value
+        return kind, self.nodes[i], value
+
+    def events(self, begin=0, end=None):
+        for i in range(begin, len(self) if end is None else end):
+            yield self.event(i)
+
+    def state_at(self, step):
+        """Cell marks (FRONTIER / EXPLORED / BWD_*) after `step` events."""
+        step  = max(0, min(step, len(self)))
+        frame = min(step // self.interval, len(self.keyframes) - 1)
+        if frame < 0:
+            return bytearray(self.rows * self.cols)
+        marks = bytearray(zlib.decompress(self.keyframes[frame]))
+        kinds, nodes = self.kinds, self.nodes
+        for i in range(frame * self.interval, step):
+            fold(marks, kinds[i], nodes[i])
+        return marks
+
+    def expanded_at(self, step):
+        """Expansions among the first `step` events."""
+        head = self.kinds[:step]
+        return head.count(pf.EV_EXPAND) + head.count(pf.EV_EXPAND | pf.EV_BWD)
+
+    def same_grid(self, other):
+        return ((self.rows, self.cols, self.grid)
+                == (other.rows, other.cols, other.grid))
+
+    def load_grid(self):
+        """Make the trace's grid, START and TARGET the live ones."""
+        pf.set_grid(self.grid, self.rows, self.cols, self.start, self.target)
+
+
+def _explored(marks):
+    return {u for u in compress(range(len(marks)), marks)
+            if marks[u] & (EXPLORED | BWD_EXPLORED)}
+
+
+def compare(a, b, step=None):
+    """How two traces of the same grid differ, as a JSON-ready dict.
+
+    Counts expansions and the cells expanded by one search but not the
+    other, after `step` events of each (default: at the end), and finds
+    the first event at which the streams diverge.
+    """
+    if not a.same_grid(b):
+        raise ValueError("traces were recorded on different grids")
+    ea = _explored(a.state_at(len(a) if step is None else step))
+    eb = _explored(b.state_at(len(b) if step is None else step))
+    diverge = next((i for i, (x, y) in enumerate(zip(a.events(), b.events())) if x != y),
+                   None if len(a) == len(b) else min(len(a), len(b)))
+
+    def summary(trace):
+        last = trace.event(len(trace) - 1) if len(trace) else (pf.EV_FAIL, None, None)
+        return {"algo": trace.algo, "events": len(trace), "expanded": trace.expanded_at(len(trace)),
+                "found": last[0] == pf.EV_FOUND,
+                "cost": round(last[2], 6) if last[0] == pf.EV_FOUND else None}
+
+    return {"a": summary(a), "b": summary(b), "only_a": len(ea - eb),
+            "only_b": len(eb - ea), "both": len(ea & eb), "diverge_at": diverge}
+
+
+def compare_marks(a, b, step):
+    """Marks for a side-by-side view: cells a explored as EXPLORED, cells
+    b explored as BWD_EXPLORED (both bits where they agree)."""
+    seen = EXPLORED | BWD_EXPLORED
+    ma = a.state_at(step).translate(bytes(EXPLORED if m & seen else 0 for m in range(256)))
+    mb = b.state_at(step).translate(bytes(BWD_EXPLORED if m & seen else 0 for m in range(256)))
+    return bytearray((int.from_bytes(ma, "big") | int.from_bytes(mb, "big"))
+                     .to_bytes(len(ma), "big"))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Inspect and compare search traces.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    info = sub.add_parser("info", help="summarise one trace")
+    info.add_argument("trace")
+    diff = sub.add_parser("compare", help="compare two traces of the same grid")
+    diff.add_argument("a")
+    diff.add_argument("b")
+    args = parser.parse_args(argv)
+
+    if args.command == "info":
+        trace = Trace(args.trace)
+        result = {"algo": trace.algo, "options": trace.options,
+                  "rows": trace.rows, "cols": trace.cols,
+                  "start": list(trace.start), "target": list(trace.target),
+                  "events": len(trace), "expanded": trace.expanded_at(len(trace)),
+                  "keyframes": len(trace.keyframes), "path_length": len(trace.path) or None}
+    else:
+        result = compare(Trace(args.a), Trace(args.b))
+    json.dump(result, sys.stdout, indent=1)
+    sys.stdout.write("\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())